@@ -1,4 +1,5 @@
 from ._base import IntervalSelector, PointSelector, SpectralSelector, Convertible, FeatureDescriptor
+from ._base import set_engine_memory_limit, get_engine_memory_limit
 from ._bipls import BiPLS
 from ._cars import CARS
 from ._fipls import FiPLS
@@ -11,7 +12,7 @@ from ._spa import SPA
 from ._vip import VIP
 from ._vip_spa import VIP_SPA
 from ._vissa import VISSA
-from .util import optimize_intervals
+from .util import optimize_intervals, optimize_intervals_batch
 
 __version__ = '0.9.0'
 
@@ -33,5 +34,8 @@ __all__ = [
     'IPLS',
     'FiPLS',
     'BiPLS',
-    'optimize_intervals'
+    'optimize_intervals',
+    'optimize_intervals_batch',
+    'set_engine_memory_limit',
+    'get_engine_memory_limit'
 ]
@@ -1,12 +1,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import threading
+
 import numpy as np
+from scipy import stats
 
 from abc import ABCMeta, abstractmethod
 
 from typing import Union, Tuple, List
-from functools import cached_property
+from functools import cached_property, partial
+
+from joblib import Parallel, delayed, effective_n_jobs
 
 import sklearn.base
 from sklearn import clone
@@ -14,14 +21,82 @@ from sklearn.base import BaseEstimator
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.feature_selection import SelectorMixin
 from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import KFold
 from sklearn.model_selection import cross_val_score
 from sklearn.utils import check_scalar
 from sklearn.utils.validation import check_is_fitted
 from numpy.random import RandomState
 
+from .util import KernelPLSCV, LRUCache
+
 from functools import wraps
 
 
+# upper bound of the number of elements of the fold statistics gathered for a chunk of subsets
+_EVALUATION_CHUNK_ELEMENTS = 2 ** 22
+# upper bound of the memory (bytes) of the fold statistics cached during a fit (see set_engine_memory_limit)
+_ENGINE_MEMORY_LIMIT_VARIABLE = 'AUSWAHL_ENGINE_MEMORY_LIMIT'
+_engine_memory_limit = int(os.environ.get(_ENGINE_MEMORY_LIMIT_VARIABLE, 2 ** 28))
+# serializes the construction of the cross validation engines of selectors evaluating candidates in threads
+_CV_ENGINE_LOCK = threading.Lock()
+
+
+def set_engine_memory_limit(limit: Union[int, None]):
+    """Set the upper bound of the memory of the fold statistics (see :class:`~auswahl.util.KernelPLSCV`), which the
+    selectors cache during a fit to cross validate PLS models on feature subsets. The estimate comprises the
+    statistics of all folds and the temporary matrices of their calculation, which amount to
+    8 * (n_cv_folds + 2) * n_features ** 2 bytes (n_features times the window width for windows of consecutive
+    features). If the estimate exceeds the limit, the feature subsets are cross validated individually.
+
+    The default limit is 256 MiB. It is read from the environment variable AUSWAHL_ENGINE_MEMORY_LIMIT on import, which
+    also configures the worker processes of joblib (for instance during benchmarking), as the limit set by this
+    function only applies to the current process.
+
+    Parameters
+    ----------
+    limit: int or None
+        Memory limit in bytes. 0 disables the caching of fold statistics, None removes the limit.
+    """
+    global _engine_memory_limit
+    if limit is not None:
+        check_scalar(limit, 'limit', target_type=(int, np.integer), min_val=0)
+    _engine_memory_limit = limit
+
+
+def get_engine_memory_limit():
+    """Retrieve the upper bound of the memory of the fold statistics in bytes (see :func:`set_engine_memory_limit`).
+
+    Returns
+    -------
+    limit: int or None
+        Memory limit in bytes. None, if the memory is not limited.
+    """
+    return _engine_memory_limit
+
+
+def _scoped_cv_engine(method):
+    """Release the cross validation engine built during a call of method, unless the call is nested in another scoped
+    call (for instance an evaluation during a fit). The fold statistics are tied to the data of the outermost call.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, '_cv_engine_scoped', False):
+            return method(self, *args, **kwargs)
+        self._cv_engine = None
+        self._cv_engine_scoped = True
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._cv_engine = None
+            del self._cv_engine_scoped
+    return wrapper
+
+
+def _covers(engine_band, band):
+    """Whether an engine holding the given band of the statistics (None for the full statistics) serves a request."""
+    return engine_band is None or (band is not None and band <= engine_band)
+
+
 class FeatureDescriptor:
     """ The class FeatureDescriptor abstracts the configuration of features the selection methods are to retrieve from
     the spectral data. The FeatureDescriptor wraps either a number of arbitrary features to be selected or a specific
@@ -207,12 +282,16 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
     """ Top level base class for all Auswahl selectors.
 
     Provides subclassing of all relevant sklearn classes, common cross validationa and hyperparameter optimization functionality.
+    PLS models evaluated on subsets of the features are cross validated from fold statistics cached during the fit,
+    whose memory is bounded by :func:`~auswahl.set_engine_memory_limit`.
 
     Parameters
     ----------
     model_hyperparams: dict
         Dictionary of hyperparameters following the sklearn convention for
-        the estimator underlying the selection algorithm.
+        the estimator underlying the selection algorithm. If only the number of
+        components of a PLS model is searched, a single model per fold is fitted
+        for all values.
 
     n_cv_folds: int
         Number of cross validation runs during model fitting
@@ -222,10 +301,25 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
 
     n_jobs: int, default=1
          Number of threads to be used to execute the selection method
+
+    evaluation_cache_size: int, default=None
+        Maximal number of cross validation results of feature subsets cached during a fit. Repeated evaluations of a
+        feature subset with the same estimator configuration are answered from the cache. If None, no results are
+        cached.
+
+    Attributes
+    ----------
+    evaluation_cache_hits_: int
+        Number of evaluations answered from the evaluation cache during the last fit. Only available, if
+        evaluation_cache_size is not None.
+
+    evaluation_cache_misses_: int
+        Number of evaluations, which were not found in the evaluation cache during the last fit. Only available,
+        if evaluation_cache_size is not None.
     """
 
     def __init__(self, model_hyperparams: Union[dict, List[dict]], n_cv_folds: int,
-                 random_state: Union[int, RandomState] = None, n_jobs: int = 1):
+                 random_state: Union[int, RandomState] = None, n_jobs: int = 1, evaluation_cache_size: int = None):
         if model_hyperparams is not None and not isinstance(model_hyperparams, (list, dict)):
             raise ValueError("Keyword argument 'model_hyperparams' is expected to be of type dict or list of dicts")
 
@@ -236,8 +330,16 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
         self.n_cv_folds = n_cv_folds
         self.random_state = random_state
         self.n_jobs = n_jobs
+        self.evaluation_cache_size = evaluation_cache_size
 
-    def evaluate(self, X, y, model, do_cv=True, *args):
+    def __getstate__(self):
+        # the fold statistics are tied to the data of the current process and rebuilt on demand
+        state = super().__getstate__()
+        state.pop('_cv_engine', None)
+        return state
+
+    @_scoped_cv_engine
+    def evaluate(self, X, y, model, do_cv=True, *args, features=None, refit=True):
         """Conduct a cross validationand hyperparameter optimization of the underlying estimator model.
 
         Parameters
@@ -258,6 +360,15 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
             Arbitrary payload returned with the evaluation result. Used for instance for
             identification of threads, if multiple models are evaluated in parallel
 
+        features: array-like of shape (n_selected,) or (n_features,), default=None
+            Indices or boolean mask of the features of X to be evaluated. If given, X is required to be the data the
+            selector is fitted on. PLS models are then cross validated using the fold statistics cached for the fit
+            (see :class:`~auswahl.util.KernelPLSCV`) instead of refitting the model on every fold.
+
+        refit: bool, default=True
+            If False, the returned estimator is not fitted to the data. Use this to avoid the fitting of models, for
+            which only the score is of interest.
+
         Returns
         -------
         tuple: float, BaseEstimator
@@ -265,18 +376,360 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
         """
 
         model = PLSRegression() if model is None else clone(model)
+        if features is None:
+            return (*self._cross_validate(X, y, model, do_cv, refit), *args)
+
+        features = np.asarray(features)
+        if features.dtype == bool:
+            features = np.flatnonzero(features)
+        model.n_components = min(model.n_components, len(features))
+
+        key = self._evaluation_key(features, model.get_params()) if do_cv else None
+        cached = self._evaluation_cache.get(key) if key is not None else None
+        if cached is not None:
+            cv_scores, model = cached[0], clone(cached[1])
+            if refit:
+                model.fit(X[:, features], y)
+            return cv_scores, model, *args
+
+        engine = self._get_cv_engine(X, y, model) if do_cv else None
+        if engine is not None and self._engine_components(engine, len(features), model) is not None:
+            cv_scores, n_components = self._engine_scores(engine, model, len(features),
+                                                          partial(engine.score_batch, features[None, :]))
+            cv_scores, model.n_components = cv_scores[0], int(n_components[0])
+            if refit:
+                model.fit(X[:, features], y)
+        else:
+            cv_scores, model = self._cross_validate(X[:, features], y, model, do_cv, refit)
+
+        if key is not None:
+            self._evaluation_cache.put(key, (cv_scores, clone(model)))
+        return cv_scores, model, *args
+
+    def _cross_validate(self, X, y, model, do_cv, refit):
         model.n_components = min(model.n_components, X.shape[1])
         if self.model_hyperparams is None:  # no hyperparameter optimization; conduct a simple CV
             cv_scores = None
             if do_cv:
                 cv_scores = np.mean(cross_val_score(model, X, y, cv=self.n_cv_folds, scoring='neg_mean_squared_error'))
-            model.fit(X, y)
-            return cv_scores, model, *args
+            if refit:
+                model.fit(X, y)
+            return cv_scores, model
+        grid = self._component_grid(model)
+        if grid is not None and np.ndim(y) == 1 and 0 < min(grid) and max(grid) <= X.shape[1]:
+            return self._search_components(X, y, model, grid, refit)
         else:
-            cv = GridSearchCV(model, self.model_hyperparams, cv=self.n_cv_folds, scoring='neg_mean_squared_error')
+            cv = GridSearchCV(model, self.model_hyperparams, cv=self.n_cv_folds, scoring='neg_mean_squared_error',
+                              refit=refit)
             cv.fit(X, y)
-            return cv.best_score_, cv.best_estimator_, *args
+            best_estimator = cv.best_estimator_ if refit else clone(model).set_params(**cv.best_params_)
+            return cv.best_score_, best_estimator
+
+    def _component_grid(self, model):
+        """Values of n_components searched by the hyperparameter optimization, if the optimization of a PLS model only
+        concerns the number of components. Otherwise, None is returned.
+        """
+        if self.model_hyperparams is None or type(model) is not PLSRegression:
+            return None
+        grids = self.model_hyperparams if isinstance(self.model_hyperparams, list) else [self.model_hyperparams]
+        values = []
+        for grid in grids:
+            if set(grid.keys()) != {'n_components'}:
+                return None
+            values.extend(grid['n_components'])
+        if len(values) == 0 or not all(isinstance(value, (int, np.integer)) for value in values):
+            return None
+        return values
+
+    def _search_components(self, X, y, model, grid, refit):
+        """Search the number of components of a PLS model. Since PLS components are nested, a single model with the
+        largest number of components in the grid is fitted per fold, which provides the predictions of all models with
+        fewer components. The result is equivalent to the one of GridSearchCV.
+        """
+        n_components = max(grid)
+        fold_scores = np.zeros((self.n_cv_folds, n_components))
+        for f, (train, test) in enumerate(KFold(self.n_cv_folds).split(X)):
+            pls = clone(model).set_params(n_components=n_components).fit(X[train], y[train])
+            y_mean = np.mean(y[train])
+            y_std = np.std(y[train], ddof=1) if model.scale else 1.0
+            y_std = 1.0 if y_std == 0.0 else y_std
+            predictions = y_mean + np.cumsum(pls.transform(X[test]) * pls.y_loadings_[0] * y_std, axis=1)
+            fold_scores[f] = -np.mean((y[test][:, None] - predictions) ** 2, axis=0)
+
+        grid_scores = fold_scores.mean(axis=0)[np.asarray(grid) - 1]
+        best = int(np.argmax(grid_scores))
+        best_estimator = clone(model).set_params(n_components=grid[best])
+        if refit:
+            best_estimator.fit(X, y)
+        return grid_scores[best], best_estimator
+
+    def _racing_components(self, X, y, model, size, confidence, band=None):
+        """Number of components of the PLS models raced on feature subsets of the given size. None is returned, if no
+        racing is requested or the evaluation can not be served by the evaluation engine. Racing is not combined with
+        hyperparameter optimizations. band is passed on to :meth:`_get_cv_engine`.
+        """
+        if confidence is None:
+            return None
+        check_scalar(confidence, 'racing_confidence', target_type=float, min_val=0, max_val=1,
+                     include_boundaries='neither')
+        engine = self._get_cv_engine(X, y, model, band)
+        if engine is None or self.model_hyperparams is not None:
+            return None
+        return self._engine_components(engine, size, model)
+
+    def _race(self, n_candidates, size, score, confidence, score_all=None):
+        """Cross validate candidate feature subsets fold by fold and drop candidates dominated by the current leader.
+
+        After each fold (starting with the third one), the paired differences of the fold scores between the leader
+        (best mean score so far) and every other candidate are tested with a one-sided t-test. Candidates, which are
+        worse than the leader at the given confidence level, are not evaluated on the remaining folds. The surviving
+        candidates are evaluated on all folds, such that their scores equal the usual cross validation scores.
+
+        Parameters
+        ----------
+        n_candidates: int
+            Number of candidates.
+
+        size: int
+            Number of features of the candidates.
+
+        score: callable
+            Maps an array of candidate indices and a fold to the scores of the candidates on the fold.
+
+        confidence: float
+            Confidence level of the elimination of candidates.
+
+        score_all: callable, default=None
+            Maps a fold to the scores of all candidates on the fold, if a more efficient evaluation of all candidates
+            is available.
 
+        Returns
+        -------
+        scores: np.ndarray of shape (n_candidates,)
+            Cross validation scores of the surviving candidates. Eliminated candidates are scored with -inf
+        """
+        fold_scores = np.empty((n_candidates, self.n_cv_folds))
+        alive = np.arange(n_candidates)
+        chunk_size = max(1, _EVALUATION_CHUNK_ELEMENTS // size ** 2)
+        for f in range(self.n_cv_folds):
+            if score_all is not None and len(alive) == n_candidates:
+                fold_scores[:, f] = score_all(f)
+            else:
+                for start in range(0, len(alive), chunk_size):
+                    fold_scores[alive[start:start + chunk_size], f] = score(alive[start:start + chunk_size], f)
+
+            n_folds = f + 1
+            if 2 < n_folds < self.n_cv_folds:
+                leader = alive[np.argmax(fold_scores[alive, :n_folds].mean(axis=1))]
+                differences = fold_scores[leader, :n_folds] - fold_scores[alive, :n_folds]
+                margin = (stats.t.ppf(confidence, n_folds - 1) * differences.std(axis=1, ddof=1)
+                          / np.sqrt(n_folds))
+                alive = alive[differences.mean(axis=1) - margin <= 0]
+
+        scores = np.full((n_candidates,), -np.inf)
+        scores[alive] = fold_scores[alive].mean(axis=1)
+        return scores
+
+    def _engine_components(self, engine, size, model):
+        """Number of components of the PLS models fitted by the evaluation engine to evaluate subsets of the given
+        size. None is returned, if the evaluation can not be served by the engine.
+        """
+        grid = self._component_grid(model)
+        if grid is None:
+            n_components = min(model.n_components, size)
+        elif 0 < min(grid) and max(grid) <= size:
+            n_components = max(grid)
+        else:
+            return None
+        return n_components if engine.supports(n_components) else None
+
+    def _engine_scores(self, engine, model, size, score):
+        """Scores of equally sized feature subsets served by the evaluation engine and the number of components of
+        the best model of each subset. score is a scoring method of the engine with the subsets bound, which is called
+        with the number of components.
+        """
+        n_components = self._engine_components(engine, size, model)
+        grid = self._component_grid(model)
+        if grid is None:
+            scores = score(n_components)
+            return scores, np.full(scores.shape, n_components)
+        grid = np.asarray(grid)
+        grid_scores = score(n_components, all_components=True)[:, grid - 1]
+        best = np.argmax(grid_scores, axis=1)
+        return grid_scores[np.arange(grid_scores.shape[0]), best], grid[best]
+
+    def _evaluation_key(self, features, model_params):
+        """Key of the evaluation of a feature subset in the evaluation cache. None is returned, if no evaluation cache
+        is active.
+        """
+        if getattr(self, '_evaluation_cache', None) is None:
+            return None
+        subset = hashlib.sha1(np.unique(features).astype(np.int64).tobytes()).hexdigest()
+        return subset, repr(sorted(model_params.items())), self.n_cv_folds, repr(self.model_hyperparams)
+
+    @_scoped_cv_engine
+    def evaluate_many(self, X, y, masks, model=None):
+        """Cross validate the underlying estimator model on many subsets of the features of X.
+
+        Subsets of equal size are grouped and evaluated in vectorized chunks using the fold statistics cached for the
+        fit (see :class:`~auswahl.util.KernelPLSCV`). The chunks are distributed across n_jobs threads. If the
+        evaluation can not be served from the cached statistics (for instance, if a hyperparameter optimization is
+        configured), the subsets are evaluated individually with :meth:`evaluate`.
+
+        Parameters
+        ----------
+        X: array-like, shape (n_samples, n_features)
+            Spectral data the selector is fitted on
+
+        y: array-like, shape (n_samples,)
+            Regression targets
+
+        masks: array-like of shape (n_subsets, n_features) or sequence of array-like
+            Boolean masks or arrays of indices of the feature subsets to be evaluated
+
+        model: BaseEstimator, default=None
+            Regression model. If None, a :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` is used
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_subsets,)
+            Cross validation scores of the subsets. Empty subsets are scored with -inf
+        """
+        return self._evaluate_many(X, y, masks, model, self.n_jobs)
+
+    def _evaluate_many(self, X, y, masks, model, n_jobs):
+        """Implementation of :meth:`evaluate_many` with n_jobs threads (or processes for the individual evaluations).
+        Callers running in worker threads pass n_jobs=1, such that the subsets are evaluated in the calling thread.
+        """
+        subsets = [np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask, dtype=int)
+                   for mask in masks]
+        sizes = np.array([len(subset) for subset in subsets], dtype=int)
+        scores = np.full((len(subsets),), -np.inf)
+
+        model = PLSRegression() if model is None else model
+        engine = self._get_cv_engine(X, y, model)
+        n_threads = effective_n_jobs(n_jobs)
+
+        # look up the subsets in the evaluation cache
+        model_params = model.get_params()
+        keys = [None] * len(subsets)
+        if getattr(self, '_evaluation_cache', None) is not None:
+            for i, subset in enumerate(subsets):
+                if sizes[i] == 0:
+                    continue
+                keys[i] = self._evaluation_key(subset, {**model_params,
+                                                        'n_components': min(model.n_components, sizes[i])})
+                cached = self._evaluation_cache.get(keys[i])
+                if cached is not None:
+                    scores[i] = cached[0]
+                    sizes[i] = 0
+
+        chunks = []
+        individual = []
+        for size in np.unique(sizes[sizes > 0]):
+            members = np.flatnonzero(sizes == size)
+            if engine is None or self._engine_components(engine, size, model) is None:
+                individual.extend(members)
+                continue
+            # bound the memory of the gathered statistics and leave work for every thread
+            chunk_size = max(1, min(_EVALUATION_CHUNK_ELEMENTS // size ** 2, int(np.ceil(len(members) / n_threads))))
+            for start in range(0, len(members), chunk_size):
+                chunks.append(members[start:start + chunk_size])
+
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self._engine_scores)(engine, model, sizes[members[0]],
+                                         partial(engine.score_batch, np.stack([subsets[i] for i in members])))
+            for members in chunks)
+        for members, (chunk_scores, n_components) in zip(chunks, results):
+            scores[members] = chunk_scores
+            for i, score, n in zip(members, chunk_scores, n_components):
+                if keys[i] is not None:
+                    self._evaluation_cache.put(keys[i], (score, clone(model).set_params(n_components=int(n))))
+
+        evaluations = Parallel(n_jobs=n_jobs)(delayed(self.evaluate)(X[:, subsets[i]], y, model, True, i,
+                                                                     refit=False)
+                                              for i in individual)
+        for score, estimator, i in evaluations:
+            scores[i] = score
+            if keys[i] is not None:
+                self._evaluation_cache.put(keys[i], (score, estimator))
+
+        return scores
+
+    @_scoped_cv_engine
+    def evaluate_windows(self, X, y, width, model=None):
+        """Cross validate the underlying estimator model on all windows of width consecutive features of X.
+
+        The windows are evaluated on the band of the fold statistics covering width consecutive features (see
+        :meth:`~auswahl.util.KernelPLSCV.score_windows`), whose memory is linear in the number of features. The
+        windows are distributed across n_jobs threads. If the evaluation can not be
+        served from the cached statistics, the windows are evaluated with :meth:`evaluate_many`.
+
+        Parameters
+        ----------
+        X: array-like, shape (n_samples, n_features)
+            Spectral data the selector is fitted on
+
+        y: array-like, shape (n_samples,)
+            Regression targets
+
+        width: int
+            Number of consecutive features of each window
+
+        model: BaseEstimator, default=None
+            Regression model. If None, a :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` is used
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_features - width + 1,)
+            Cross validation scores of the windows, indexed by their first feature
+        """
+        n_windows = X.shape[1] - width + 1
+        model = PLSRegression() if model is None else model
+        engine = self._get_cv_engine(X, y, model, band=width)
+        if engine is None or self._engine_components(engine, width, model) is None:
+            return self.evaluate_many(X, y, np.arange(n_windows)[:, None] + np.arange(width)[None, :], model)
+
+        chunk_size = max(1, min(_EVALUATION_CHUNK_ELEMENTS // width ** 2,
+                                int(np.ceil(n_windows / effective_n_jobs(self.n_jobs)))))
+        results = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._engine_scores)(engine, model, width,
+                                         partial(engine.score_windows, width, start=start,
+                                                 stop=min(start + chunk_size, n_windows)))
+            for start in range(0, n_windows, chunk_size))
+        return np.concatenate([scores for scores, _ in results])
+
+    def _get_cv_engine(self, X, y, model, band=None):
+        """Retrieve the cross validation engine caching the fold statistics of the data the selector is fitted on.
+        The engine is built once on the first request during a fit (or a public evaluation) and released afterwards,
+        also if the candidates are evaluated in threads. If band is not None, only windows of at most band
+        consecutive features are to be scored and an engine holding the band of the statistics suffices. None is
+        returned, if the evaluation of the model can not be served by the engine or its statistics exceed the memory
+        limit (see :func:`set_engine_memory_limit`).
+        """
+        model = PLSRegression() if model is None else model
+        if type(model) is not PLSRegression:
+            return None
+        if self.model_hyperparams is not None and self._component_grid(model) is None:
+            return None
+        if np.ndim(y) > 1 and np.shape(y)[1] != 1:
+            return None
+        if self.n_cv_folds < 2 or X.shape[0] < self.n_cv_folds:
+            return None
+        band = None if band is None else min(band, X.shape[1])
+        size = 8 * (self.n_cv_folds + 2) * X.shape[1] * (X.shape[1] if band is None else band)
+        if _engine_memory_limit is not None and size > _engine_memory_limit:
+            return None  # fold statistics exceed the memory limit (see set_engine_memory_limit)
+
+        key = (id(X), id(y), X.shape, self.n_cv_folds, model.scale)
+        with _CV_ENGINE_LOCK:
+            engine = getattr(self, '_cv_engine', None)
+            if engine is None or engine[0] != key or not _covers(engine[1].band, band):
+                engine = (key, KernelPLSCV(X, y, self.n_cv_folds, scale=model.scale, band=band))
+                self._cv_engine = engine
+        return engine[1]
+
+    @_scoped_cv_engine
     def fit(self, X, y, mask=None):
         """Run the feature selection process.
 
@@ -305,7 +758,16 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
             X = X[:, mask_indices]
 
         X, y = self._validate_data(X, y, accept_sparse=False, ensure_min_samples=2, ensure_min_features=2)
-        self._dispatch_fit(X, y)
+
+        # the evaluations cached during the fit are tied to X and released afterwards (as the fold statistics)
+        self._evaluation_cache = self._make_evaluation_cache()
+        try:
+            self._dispatch_fit(X, y)
+            if self._evaluation_cache is not None:
+                self.evaluation_cache_hits_ = self._evaluation_cache.hits
+                self.evaluation_cache_misses_ = self._evaluation_cache.misses
+        finally:
+            self._evaluation_cache = None
 
         if mask is not None:
             selected = mask_indices[np.nonzero(self.support_)]
@@ -314,6 +776,12 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
 
         return self
 
+    def _make_evaluation_cache(self):
+        if self.evaluation_cache_size is None:
+            return None
+        check_scalar(self.evaluation_cache_size, name='evaluation_cache_size', target_type=int, min_val=1)
+        return LRUCache(self.evaluation_cache_size)
+
     def get_best_estimator(self) -> sklearn.base.BaseEstimator:
         """Retrieve the best estimator model fitted on the selected features
 
@@ -340,6 +808,16 @@ class SpectralSelector(SelectorMixin, BaseEstimator, metaclass=ABCMeta):
         """
         self.n_jobs = n_jobs
 
+    def reset_caches(self):
+        """ Cache resetting interface for benchmarking. Discards the results, which the selector caches across fits
+        (for instance the paths of :class:`~auswahl.CARS` with reuse_paths), such that the next fit is conducted from
+        scratch. Selector methods with more complex internal structure (such as methods wrapping other methods) are
+        required to override this function accordingly.
+        """
+        for name, value in list(vars(self).items()):
+            if isinstance(value, LRUCache):
+                setattr(self, name, None)
+
     def _get_support_mask(self):
         check_is_fitted(self)
         return self.support_
@@ -372,6 +850,9 @@ class PointSelector(SpectralSelector, metaclass=ABCMeta):
 
     n_jobs: int, default=1
          Number of threads to be used to execute the selection method
+
+    evaluation_cache_size: int, default=None
+        Maximal number of cross validation results of feature subsets cached during a fit
     """
 
     def __init__(self,
@@ -379,9 +860,10 @@ class PointSelector(SpectralSelector, metaclass=ABCMeta):
                  model_hyperparams: Union[dict, List[dict]] = None,
                  n_cv_folds: int = 2,
                  random_state: Union[int, RandomState] = None,
-                 n_jobs: int = 1):
+                 n_jobs: int = 1,
+                 evaluation_cache_size: int = None):
         self.n_features_to_select = n_features_to_select
-        super().__init__(model_hyperparams, n_cv_folds, random_state, n_jobs)
+        super().__init__(model_hyperparams, n_cv_folds, random_state, n_jobs, evaluation_cache_size)
 
     def _dispatch_fit(self, X, y):
         n_features_to_select = self._check_n_features_to_select(X)
@@ -438,6 +920,9 @@ class IntervalSelector(SpectralSelector, metaclass=ABCMeta):
 
     n_jobs: int, default=1
          Number of threads to be used to execute the selection method
+
+    evaluation_cache_size: int, default=None
+        Maximal number of cross validation results of feature subsets cached during a fit
     """
 
     def __init__(self,
@@ -445,10 +930,11 @@ class IntervalSelector(SpectralSelector, metaclass=ABCMeta):
                  interval_width: Union[int, float] = 1, n_cv_folds: int = 1,
                  model_hyperparams: Union[dict, List[dict]] = None,
                  random_state: Union[int, RandomState] = None,
-                 n_jobs: int = 1):
+                 n_jobs: int = 1,
+                 evaluation_cache_size: int = None):
         self.n_intervals_to_select = n_intervals_to_select
         self.interval_width = interval_width
-        super().__init__(model_hyperparams, n_cv_folds, random_state, n_jobs)
+        super().__init__(model_hyperparams, n_cv_folds, random_state, n_jobs, evaluation_cache_size)
 
     def _dispatch_fit(self, X, y):
         self._check_n_intervals_to_select(X)
@@ -1,11 +1,15 @@
+import copy
+from functools import partial
 from typing import Union, Dict, List
 
 import numpy as np
-from joblib import Parallel, delayed
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils.validation import check_is_fitted
 
 from ._base import IntervalSelector
+from .util import LRUCache, fingerprint
+
+_ELIMINATION_PATH_CACHE_SIZE = 16
 
 
 class BiPLS(IntervalSelector):
@@ -13,6 +17,8 @@ class BiPLS(IntervalSelector):
 
     The method separates the features space into intervals of equal width and sequentially removes the worst interval.
     The last interval is smaller if the total number of features is not a whole multiple of the interval width.
+    The complete elimination path is cached for the data, such that refitting the selector with a different number of
+    intervals to select (for instance after a reparameterization during benchmarking) does not repeat the elimination.
 
     The BiPLS method has been described in Xiaobo et al. [1]_.
 
@@ -34,7 +40,7 @@ class BiPLS(IntervalSelector):
         Number of cross validation folds used to evaluate intervals
 
     n_jobs : int, default=1
-        Number of parallel processes that fit PLS models on the different intervals
+        Number of parallel threads that fit PLS models on the different intervals
 
     Attributes
     ----------
@@ -77,27 +83,69 @@ class BiPLS(IntervalSelector):
         self.n_cv_folds = n_cv_folds
 
     def _fit(self, X, y, n_intervals_to_select, interval_width):
+        path = self._elimination_path(X, y, interval_width)
+        n_intervals_to_remove = len(path['order']) + 1 - n_intervals_to_select
+
         selection = np.ones(X.shape[1], dtype=bool)
         rank = np.ones(X.shape[1])
-        free_idx = [i for i in range(0, X.shape[1], interval_width)]
-        n_intervals_to_remove = len(free_idx) - n_intervals_to_select
-
-        with Parallel(n_jobs=self.n_jobs) as parallel:
-            for n in range(len(free_idx) - n_intervals_to_select):
-                x_free = X[:, selection]
-                n_features = x_free.shape[1]
-                evaluations = parallel(delayed(self.evaluate)
-                                       (np.delete(x_free, np.r_[i:min(n_features, i + interval_width)], axis=1), y,
-                                        self.pls)
-                                       for i in range(0, n_features, interval_width))
-                scores, models = list(zip(*evaluations))
-                best = np.argmax(scores)
-                worst_interval = free_idx[best]
-                selection[worst_interval:worst_interval + interval_width] = 0
-                self.best_model_ = models[best]
-                free_idx.remove(worst_interval)
-                rank[worst_interval:worst_interval + interval_width] = n / n_intervals_to_remove
+        for n, worst_interval in enumerate(path['order'][:n_intervals_to_remove]):
+            selection[worst_interval:worst_interval + interval_width] = 0
+            rank[worst_interval:worst_interval + interval_width] = n / n_intervals_to_remove
 
         self.support_ = selection
         self.rank_ = rank
+        if n_intervals_to_select not in path['models']:
+            _, path['models'][n_intervals_to_select] = self.evaluate(X[:, selection], y, self.pls, do_cv=False)
+        self.best_model_ = copy.deepcopy(path['models'][n_intervals_to_select])
         return self
+
+    def _elimination_path(self, X, y, interval_width):
+        """Retrieve the complete elimination path of the intervals of the given width. Since the elimination is
+        greedy, the selections of all numbers of intervals are prefixes of this path. The path is cached for the data,
+        such that refits after a reparameterization of n_intervals_to_select reuse it.
+        """
+        key = (fingerprint(X, y), interval_width, self.n_cv_folds, repr(self.model_hyperparams),
+               None if self.pls is None else repr(sorted(self.pls.get_params().items())))
+        if getattr(self, '_elimination_paths', None) is None:
+            self._elimination_paths = LRUCache(maxsize=_ELIMINATION_PATH_CACHE_SIZE)
+        path = self._elimination_paths.get(key)
+        if path is not None:
+            return path
+
+        selection = np.ones(X.shape[1], dtype=bool)
+        free_idx = [i for i in range(0, X.shape[1], interval_width)]
+        order = []
+        scores = []
+        while len(free_idx) > 1:
+            selected_idx = np.arange(X.shape[1])[selection]
+            # candidate i keeps all selected features except the i-th interval
+            masks = np.ones((len(free_idx), len(selected_idx)), dtype=bool)
+            for i in range(len(free_idx)):
+                masks[i, i * interval_width:(i + 1) * interval_width] = False
+            candidate_scores = self._score_candidates(X, y, selected_idx, masks)
+            best = np.argmax(candidate_scores)
+            worst_interval = free_idx[best]
+            selection[worst_interval:worst_interval + interval_width] = 0
+            free_idx.remove(worst_interval)
+            order.append(worst_interval)
+            scores.append(candidate_scores[best])
+
+        # scores[n] is the cross validation score of the selection remaining after n + 1 eliminations
+        path = {'order': order, 'scores': np.array(scores), 'models': {}}
+        self._elimination_paths.put(key, path)
+        return path
+
+    def _score_candidates(self, X, y, selected_idx, masks):
+        # the statistics of the selected features are shared by all candidates and downdated by masking
+        pls = PLSRegression() if self.pls is None else self.pls
+        engine = self._get_cv_engine(X, y, pls)
+        sizes = masks.sum(axis=1)
+        scores = np.full((masks.shape[0],), -np.inf)
+        for size in np.unique(sizes):
+            members = np.flatnonzero(sizes == size)
+            if engine is not None and self._engine_components(engine, size, pls) is not None:
+                scores[members], _ = self._engine_scores(engine, pls, size,
+                                                         partial(engine.score_masked, selected_idx, masks[members]))
+            else:
+                scores[members] = self.evaluate_many(X, y, [selected_idx[mask] for mask in masks[members]], pls)
+        return scores
@@ -1,3 +1,4 @@
+import copy
 import warnings
 from typing import Union, Dict, List
 
@@ -6,11 +7,14 @@ from joblib import Parallel, delayed
 from sklearn import clone
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils import check_random_state
-from sklearn.utils.validation import check_is_fitted
+from sklearn.utils.validation import check_is_fitted, check_scalar
 
-from .util import get_coef_from_pls
+from .util import LRUCache, fingerprint, get_coef_from_pls
+from .util._kernel_pls import _kernel_pls1
 from ._base import PointSelector
 
+_PATH_CACHE_SIZE = 16
+
 
 class CARS(PointSelector):
     """Feature selection with Competitive Adaptive Reweighted Sampling (CARS).
@@ -48,11 +52,35 @@ class CARS(PointSelector):
     random_state : int or numpy.random.RandomState, default=None
         Seed for the random subset sampling. Pass an int for reproducible output across function calls.
 
+    wave_size : int, default=None
+        If not None, the CARS runs are conducted in waves of wave_size runs. The runs stop, once the feature
+        importance and the best score of the candidates have converged within a wave (see tol) or n_cars_runs runs
+        have been conducted.
+
+    tol : float, default=0.01
+        Tolerance of the convergence of the runs, if wave_size is not None. The runs are converged, if no feature
+        importance changes by more than tol and the best score changes by at most tol relative to its previous value.
+
+    reuse_paths : bool, default=False
+        If True, the paths of the CARS runs are cached for the data and the random state. A subsequent fit with an equal
+        or larger n_features_to_select (for instance after a reparameterization during benchmarking) selects the
+        candidate of each run from the cached paths instead of repeating the runs. The candidate of a run is then the
+        last stage with at least n_features_to_select features, reduced to the features with the largest weights.
+
     Attributes
     ----------
     support_ : ndarray of shape (n_features,)
         Mask of selected features
 
+    feature_importance_ : ndarray of shape (n_features,)
+        Frequency of the features in the candidates of the CARS runs.
+
+    n_cars_runs_used_ : int
+        Number of CARS runs conducted. Smaller than n_cars_runs, if the runs converged early (see wave_size).
+
+    paths_ : list of list of ndarray
+        Features of each stage of each CARS run, ordered by decreasing regression weight.
+
     References
     ----------
     .. [1] Hongdong Li,Yizeng Liang, Qingsong Xu and Dongsheng Cao,
@@ -79,7 +107,10 @@ class CARS(PointSelector):
                  n_cv_folds: int = 5,
                  pls: PLSRegression = None,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 random_state: Union[int, np.random.RandomState] = None):
+                 random_state: Union[int, np.random.RandomState] = None,
+                 wave_size: int = None,
+                 tol: float = 0.01,
+                 reuse_paths: bool = False):
 
         super().__init__(n_features_to_select, model_hyperparams, n_cv_folds, random_state, n_jobs)
 
@@ -87,6 +118,9 @@ class CARS(PointSelector):
         self.n_cars_runs = n_cars_runs
         self.n_sample_runs = n_sample_runs
         self.fit_samples_ratio = fit_samples_ratio
+        self.wave_size = wave_size
+        self.tol = tol
+        self.reuse_paths = reuse_paths
 
     def _prepare_edf_schedule(self, n_wavelengths, ):
         a = (n_wavelengths/2)**(1/(self.n_sample_runs-1))
@@ -97,36 +131,46 @@ class CARS(PointSelector):
 
         return (selection_ratios*n_wavelengths + 1e-10).astype('int')
 
-    def _get_wavelength_weights(self, X, y, n_fit_samples, wavelengths, pls, random_state):
+    def _get_wavelength_weights(self, X, y, n_fit_samples, wavelengths, pls, random_state, statistics, block=None):
         fitting_samples = random_state.choice(X.shape[0],
                                               n_fit_samples,
                                               replace=False)
 
-        x_pls_fit = X[fitting_samples, :][:, wavelengths]
-        y_pls_fit = y[fitting_samples]
+        if self.model_hyperparams is None:
+            n_components = min(pls.n_components, len(wavelengths))
+            weights = np.abs(statistics.coefs(fitting_samples, wavelengths, n_components, block))
+        else:
+            x_pls_fit = X[np.ix_(fitting_samples, wavelengths)]
+            y_pls_fit = y[fitting_samples]
 
-        _, model = self.evaluate(x_pls_fit, y_pls_fit, pls, do_cv=False)
-        weights = np.abs(get_coef_from_pls(model)).flatten()
+            _, model = self.evaluate(x_pls_fit, y_pls_fit, pls, do_cv=False)
+            weights = np.abs(get_coef_from_pls(model)).flatten()
         wavelength_weights = np.zeros(X.shape[1])
         wavelength_weights[wavelengths] = weights
 
         return wavelength_weights
 
-    def _fit_cars(self, X, y, n_features_to_select, edf_schedule, pls, seed):
+    def _fit_cars(self, X, y, n_features_to_select, edf_schedule, pls, seed, statistics):
         pls = PLSRegression() if pls is None else clone(pls)
         random_state = check_random_state(seed)
 
         n_fit_samples = int(X.shape[0] * self.fit_samples_ratio)
 
         wavelengths = np.arange(X.shape[1])
+        path = []
+        block = None
         for i in range(self.n_sample_runs):
+            # the block of the cross-product matrix shrinks with the surviving wavelengths (sorted by np.unique)
+            if len(wavelengths) < X.shape[0]:
+                block = statistics.gram_block(wavelengths, block)
 
             weights = self._get_wavelength_weights(X, y,
                                                    n_fit_samples, wavelengths,
-                                                   pls, random_state)
+                                                   pls, random_state, statistics, block)
             # ensure, that at least n_features_to_select scheduled
             scheduled = max(edf_schedule[i], n_features_to_select)
-            wavelengths = np.argsort(-weights)[:scheduled]
+            ranking = np.argsort(-weights)
+            wavelengths = ranking[:scheduled]
             wavelength_probs = weights[wavelengths] / np.sum(weights[wavelengths])
 
             # ensure, that n_features_to_select features are always selected
@@ -142,39 +186,100 @@ class CARS(PointSelector):
 
             wavelengths = np.concatenate([base_wavelengths, additional_wavelengths])
             wavelengths = np.unique(wavelengths)
+            path.append(ranking[np.isin(ranking, wavelengths)])
 
             if wavelengths.shape[0] == n_features_to_select:
                 break
 
-        score, model = self.evaluate(X[:, wavelengths], y, pls)
+        return path
+
+    def _evaluate_path(self, X, y, path, n_features_to_select, path_target):
+        """Evaluate the candidate of a CARS run for n_features_to_select features. If the run has been conducted for
+        this number of features, the candidate is the last stage. Otherwise, it is the last stage with at least
+        n_features_to_select features, reduced to the features with the largest weights.
+        """
+        if n_features_to_select == path_target:
+            wavelengths = np.sort(path[-1])
+        else:
+            stage = max(np.flatnonzero([len(wavelengths) >= n_features_to_select for wavelengths in path]), default=0)
+            wavelengths = np.sort(path[stage][:n_features_to_select])
+        # the candidates are few and small, hence they are cross validated individually instead of caching the fold
+        # statistics of all features
+        score, model = self.evaluate(X[:, wavelengths], y, self.pls)
         return score, wavelengths, model
 
     def _calculate_feature_importance(self, n_features, selection_candidates):
         importance = np.zeros((n_features,))
         for score, wavelengths, _ in selection_candidates:
             importance[wavelengths] = importance[wavelengths] + np.ones((len(wavelengths, )))
-        return importance / self.n_cars_runs
+        return importance / len(selection_candidates)
 
     def _fit(self, X, y, n_features_to_select):
         self._check_n_sample_runs()
         self._check_fit_samples_ratio()
+        wave_size = self._check_wave_size()
 
         random_state = check_random_state(self.random_state)
         seeds = random_state.random_integers(0, 1000000, self.n_cars_runs)
 
+        key = None
+        paths = None
+        if self.reuse_paths:
+            if getattr(self, '_path_cache', None) is None:
+                self._path_cache = LRUCache(maxsize=_PATH_CACHE_SIZE)
+            key = (fingerprint(X, y), tuple(seeds), self.n_sample_runs, self.fit_samples_ratio, self.n_cv_folds,
+                   repr(self.model_hyperparams),
+                   None if self.pls is None else repr(sorted(self.pls.get_params().items())))
+            paths = self._path_cache.get(key)
+
+        # cached paths can serve targets not exceeding the size of their first stages
+        if paths is None or paths['target'] > n_features_to_select or \
+                any(len(path[0]) < n_features_to_select for path in paths['runs']):
+            paths = {'target': n_features_to_select, 'runs': [], 'candidates': {}}
+            if key is not None:
+                self._path_cache.put(key, paths)
+        candidates = paths['candidates'].setdefault(n_features_to_select, [])
+
         edf_schedule = self._prepare_edf_schedule(X.shape[1])
+        statistics = None
+        importance, best_score = None, None
+        for start in range(0, self.n_cars_runs, wave_size):
+            stop = min(start + wave_size, self.n_cars_runs)
+            if len(paths['runs']) < stop:
+                if statistics is None:
+                    statistics = _SampleStatistics(X, y, scale=True if self.pls is None else self.pls.scale)
+                # the runs share the data and its statistics in threads
+                paths['runs'].extend(Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                    delayed(self._fit_cars)(X, y, paths['target'], edf_schedule, self.pls, seeds[i], statistics)
+                    for i in range(len(paths['runs']), stop)))
+            if len(candidates) < stop:
+                candidates.extend(Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                    delayed(self._evaluate_path)(X, y, paths['runs'][i], n_features_to_select, paths['target'])
+                    for i in range(len(candidates), stop)))
+
+            # stop, if the selection frequencies and the best score did not change within the last wave
+            previous_importance, previous_best_score = importance, best_score
+            importance = self._calculate_feature_importance(X.shape[1], candidates[:stop])
+            best_score = max(score for score, _, _ in candidates[:stop])
+            if previous_importance is not None and \
+                    np.max(np.abs(importance - previous_importance)) <= self.tol and \
+                    abs(best_score - previous_best_score) <= self.tol * abs(previous_best_score):
+                break
 
-        candidates = Parallel(n_jobs=self.n_jobs)(delayed(self._fit_cars)(X,
-                                                                          y,
-                                                                          n_features_to_select,
-                                                                          edf_schedule,
-                                                                          self.pls,
-                                                                          seeds[i]) for i in range(self.n_cars_runs))
-        score, opt_wavelengths, best_model = max(candidates, key=lambda x: x[0])
-        self.feature_importance_ = self._calculate_feature_importance(X.shape[1], candidates)
+        self.n_cars_runs_used_ = stop
+        score, opt_wavelengths, best_model = max(candidates[:stop], key=lambda x: x[0])
+        self.paths_ = paths['runs'][:stop]
+        self.feature_importance_ = importance
         self.support_ = np.zeros(X.shape[1]).astype('bool')
         self.support_[opt_wavelengths] = True
-        self.best_model_ = best_model
+        self.best_model_ = copy.deepcopy(best_model)
+
+    def _check_wave_size(self):
+        if self.wave_size is None:
+            return self.n_cars_runs
+        check_scalar(self.wave_size, 'wave_size', target_type=int, min_val=1)
+        check_scalar(self.tol, 'tol', target_type=float, min_val=0)
+        return self.wave_size
 
     def _check_fit_samples_ratio(self):
         if self.fit_samples_ratio < 0:
@@ -188,3 +293,77 @@ class CARS(PointSelector):
         if self.n_sample_runs < 2:
             raise ValueError('n_sample_runs is required to be >= 2. '
                              f'Got {self.n_sample_runs}')
+
+
+class _SampleStatistics:
+    """Cross-products of the complete data, from which the PLS models of CARS are fitted on subsets of samples and
+    features. If fewer features than samples are involved, the statistics of a subset of samples are obtained from a
+    block of the cross-product matrix (see :meth:`gram_block`) by removing the contributions of the excluded samples.
+    Otherwise, the products with the cross-product matrix are evaluated via the data of the subset. The models are
+    fitted with the kernel PLS algorithm (see :func:`~auswahl.util.kernel_pls1`) and agree with
+    :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>`.
+
+    The cross-product matrix of all features is only formed, if there are fewer features than samples. It is shared
+    by all runs. Otherwise, each run forms the block of its surviving features, once they are fewer than the samples,
+    and restricts it in the subsequent stages. Hence, no block exceeds n_samples x n_samples.
+    """
+
+    def __init__(self, X, y, scale=True):
+        X = np.asarray(X, dtype=float)
+        self.y = np.asarray(y, dtype=float).reshape(-1)
+        self.scale = scale
+        # center globally to avoid cancellation in the downdated cross-products
+        self.x_centered = X - X.mean(axis=0)
+        self.x_sum = self.x_centered.sum(axis=0)
+        self.xty = self.x_centered.T @ self.y
+        n_samples, n_features = X.shape
+        self.gram = (np.arange(n_features), self.x_centered.T @ self.x_centered) if n_features < n_samples else None
+
+    def gram_block(self, features, block=None):
+        """Block of the cross-product matrix of the (sorted) features as a tuple of the features and the matrix. If
+        the block of a superset of the features is given, it is restricted instead of formed from the data.
+        """
+        block = self.gram if block is None else block
+        if block is None:
+            x = self.x_centered[:, features]
+            return features, x.T @ x
+        idx = np.searchsorted(block[0], features)
+        return features, block[1][np.ix_(idx, idx)]
+
+    def coefs(self, samples, features, n_components, block=None):
+        """Regression coefficients (w.r.t. the scaled features) of a PLS model fitted on a subset of the samples and
+        features, as provided by the coef_ attribute of PLSRegression. If given, block is the block of the
+        cross-product matrix of the features (see :meth:`gram_block`).
+        """
+        n_samples = len(samples)
+        y = self.y[samples]
+        y_mean = y.mean()
+        y_std = y.std(ddof=1) if self.scale else 1.0
+        y_std = 1.0 if y_std == 0.0 else y_std
+
+        if block is not None:
+            excluded = np.ones((self.x_centered.shape[0],), dtype=bool)
+            excluded[samples] = False
+            x_excluded = self.x_centered[np.ix_(excluded, features)]
+            shift = (self.x_sum[features] - x_excluded.sum(axis=0)) / n_samples
+            xtx = block[1] - x_excluded.T @ x_excluded - n_samples * np.outer(shift, shift)
+            xty = self.xty[features] - x_excluded.T @ self.y[excluded] - n_samples * shift * y_mean
+            x_std = np.sqrt(np.maximum(np.diag(xtx), 0) / (n_samples - 1)) if self.scale else np.ones(len(features))
+            x_std[x_std == 0.0] = 1.0
+            xtx = xtx / np.outer(x_std, x_std)
+            xty = xty / x_std
+
+            def xtx_product(r):
+                return r @ xtx
+        else:
+            x = self.x_centered[np.ix_(samples, features)]
+            x -= x.mean(axis=0)
+            x_std = x.std(axis=0, ddof=1) if self.scale else np.ones(len(features))
+            x_std[x_std == 0.0] = 1.0
+            x /= x_std
+            xty = x.T @ (y - y_mean)
+
+            def xtx_product(r):
+                return (x @ r.T).T @ x
+
+        return _kernel_pls1(xtx_product, xty[None, :] / y_std, n_components)[0, -1] * y_std
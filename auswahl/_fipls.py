@@ -1,7 +1,7 @@
+from functools import partial
 from typing import Union, List, Dict
 
 import numpy as np
-from joblib import Parallel, delayed
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils.validation import check_is_fitted
 
@@ -32,7 +32,12 @@ class FiPLS(IntervalSelector):
         Number of cross validation folds used to evaluate intervals
 
     n_jobs : int, default=1
-        Number of parallel processes that fit PLS models on the different intervals
+        Number of parallel threads that fit PLS models on the different intervals
+
+    racing_confidence : float, default=None
+        If not None, candidates are cross validated fold by fold and candidates performing significantly worse than
+        the current best candidate at this confidence level (for instance 0.95) are not evaluated on the remaining
+        folds. Racing is not combined with a hyperparameter optimization (model_hyperparams).
 
     Attributes
     ----------
@@ -63,27 +68,49 @@ class FiPLS(IntervalSelector):
                  pls: PLSRegression = None,
                  n_cv_folds: int = 10,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 n_jobs: int = 1):
+                 n_jobs: int = 1,
+                 racing_confidence: float = None):
         super().__init__(n_intervals_to_select, interval_width,
                          n_cv_folds=n_cv_folds, model_hyperparams=model_hyperparams, n_jobs=n_jobs)
         self.pls = pls
         self.n_cv_folds = n_cv_folds
+        self.racing_confidence = racing_confidence
 
     def _fit(self, X, y, n_intervals_to_select, interval_width):
         selection = np.zeros(X.shape[1], dtype=bool)
 
-        with Parallel(n_jobs=self.n_jobs) as parallel:
-            for n in range(n_intervals_to_select):
-                x_selected = X[:, selection]
-                x_free = X[:, ~selection]
-                free_idx = np.arange(X.shape[1])[~selection]
-                evaluations = parallel(delayed(self.evaluate)
-                                  (np.concatenate([x_selected, x_free[:, i:i + interval_width]], axis=1), y, self.pls)
-                                  for i in range(len(free_idx) - interval_width + 1))
-                scores, models = list(zip(*evaluations))
-                best_idx = np.argmax(scores)
-                selection[free_idx[best_idx]:free_idx[best_idx + interval_width - 1] + 1] = 1
-                self.best_model_ = models[best_idx]
+        for n in range(n_intervals_to_select):
+            selected_idx = np.arange(X.shape[1])[selection]
+            free_idx = np.arange(X.shape[1])[~selection]
+            scores = self._score_candidates(X, y, selected_idx, free_idx, interval_width)
+            best_idx = np.argmax(scores)
+            selection[free_idx[best_idx]:free_idx[best_idx + interval_width - 1] + 1] = 1
 
         self.support_ = selection
+        _, self.best_model_ = self.evaluate(X[:, selection], y, self.pls, do_cv=False)
         return self
+
+    def _score_candidates(self, X, y, selected_idx, free_idx, interval_width):
+        # the statistics of the selected features are shared by all candidates of a step
+        pls = PLSRegression() if self.pls is None else self.pls
+        engine = self._get_cv_engine(X, y, pls)
+        n_features = len(selected_idx) + interval_width
+        n_candidates = len(free_idx) - interval_width + 1
+        n_components = self._racing_components(X, y, pls, n_features, self.racing_confidence)
+        if n_components is not None:
+            def score(candidates, fold):
+                features = np.concatenate([np.broadcast_to(selected_idx, (len(candidates), len(selected_idx))),
+                                           free_idx[candidates[:, None] + np.arange(interval_width)]], axis=1)
+                return engine.score_batch(features, n_components, folds=[fold])
+
+            def score_all(fold):
+                return engine.score_extensions(selected_idx, free_idx, interval_width, n_components, folds=[fold])
+
+            return self._race(n_candidates, n_features, score, self.racing_confidence, score_all)
+        if engine is not None and self._engine_components(engine, n_features, pls) is not None:
+            scores, _ = self._engine_scores(engine, pls, n_features,
+                                            partial(engine.score_extensions, selected_idx, free_idx, interval_width))
+            return scores
+        candidates = [np.concatenate([selected_idx, free_idx[i:i + interval_width]])
+                      for i in range(n_candidates)]
+        return self.evaluate_many(X, y, candidates, pls)
@@ -2,11 +2,10 @@ import warnings
 from typing import Union, Dict, List
 
 import numpy as np
-from joblib import Parallel, delayed
 from sklearn.cross_decomposition import PLSRegression
-from sklearn.utils.validation import check_is_fitted
+from sklearn.utils.validation import check_is_fitted, check_X_y
 
-from ._base import IntervalSelector
+from ._base import IntervalSelector, _scoped_cv_engine
 from ._base import FeatureDescriptor
 
 
@@ -29,6 +28,11 @@ class IPLS(IntervalSelector):
         Estimator instance of the :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` class. Use this
         to adjust the hyperparameters of the PLS method.
 
+    racing_confidence : float, default=None
+        If not None, candidates are cross validated fold by fold and candidates performing significantly worse than
+        the current best candidate at this confidence level (for instance 0.95) are not evaluated on the remaining
+        folds. Racing is not combined with a hyperparameter optimization (model_hyperparams).
+
     Attributes
     ----------
     support_ : ndarray of shape (n_features,)
@@ -62,7 +66,8 @@ class IPLS(IntervalSelector):
                  pls: PLSRegression = None,
                  n_jobs: int = 1,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 random_state: Union[int, np.random.RandomState] = None):
+                 random_state: Union[int, np.random.RandomState] = None,
+                 racing_confidence: float = None):
 
         super().__init__(n_intervals_to_select=1, interval_width=interval_width,
                          model_hyperparams=model_hyperparams, n_cv_folds=n_cv_folds, n_jobs=n_jobs)
@@ -75,23 +80,69 @@ class IPLS(IntervalSelector):
 
         self.pls = pls
         self.random_state = random_state
-
-    def _fit_ipls(self, X, y, interval_width, pls, start):
-        score, model = self.evaluate(X[:, np.arange(start, start + interval_width, dtype='int')],
-                                     y,
-                                     pls)
-        return score, model, start
+        self.racing_confidence = racing_confidence
 
     def _fit(self, X, y, n_intervals_to_select, interval_width):
-        candidates = Parallel(n_jobs=self.n_jobs)(delayed(self._fit_ipls)(X,
-                                                                          y,
-                                                                          interval_width * n_intervals_to_select,
-                                                                          self.pls,
-                                                                          i) for i in range(X.shape[-1]-interval_width+1))
-        score, best_model, start = max(candidates, key=lambda x: x[0])
+        interval_width = interval_width * n_intervals_to_select
+        scores = self._score_windows(X, y, interval_width)
+        start = np.argmax(scores)
         self.support_ = np.zeros(X.shape[1]).astype('bool')
         self.support_[start:start + interval_width] = True
-        self.best_model_ = best_model
+        _, self.best_model_ = self.evaluate(X[:, self.support_], y, self.pls, do_cv=False)
+
+    @_scoped_cv_engine
+    def score_widths(self, X, y, interval_widths: List[int]):
+        """Score the intervals of several widths at every start position. The fold statistics of the data are
+        calculated once and shared by all widths.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            The input samples.
+
+        y : array-like of shape (n_samples,)
+            The target values.
+
+        interval_widths : list or range of int
+            Widths of the intervals.
+
+        Returns
+        -------
+        scores : ndarray of shape (n_widths, n_features - min(interval_widths) + 1)
+            Cross validation scores of the intervals indexed by width and start position. Start positions, at which an
+            interval of the respective width does not fit into the features, are scored with -inf.
+
+        best_starts : ndarray of shape (n_widths,)
+            Start positions of the best interval of each width.
+        """
+        X, y = check_X_y(X, y, ensure_min_samples=2, ensure_min_features=2)
+        interval_widths = np.asarray(interval_widths, dtype=int).reshape(-1)
+        if len(interval_widths) == 0 or np.any(interval_widths < 1) or np.any(interval_widths > X.shape[1]):
+            raise ValueError(f'Interval widths are expected to be in [1, {X.shape[1]}]. Got {interval_widths}')
+
+        scores = np.full((len(interval_widths), X.shape[1] - np.min(interval_widths) + 1), -np.inf)
+        # the band of the widest intervals serves all widths
+        self._get_cv_engine(X, y, PLSRegression() if self.pls is None else self.pls, band=int(np.max(interval_widths)))
+        for i, interval_width in enumerate(interval_widths):
+            scores[i, :X.shape[1] - interval_width + 1] = self._score_windows(X, y, interval_width)
+        return scores, np.argmax(scores, axis=1)
+
+    def _score_windows(self, X, y, interval_width):
+        pls = PLSRegression() if self.pls is None else self.pls
+        n_components = self._racing_components(X, y, pls, interval_width, self.racing_confidence,
+                                               band=interval_width)
+        if n_components is None:
+            return self.evaluate_windows(X, y, interval_width, pls)
+
+        engine = self._get_cv_engine(X, y, pls, band=interval_width)
+
+        def score(candidates, fold):
+            return engine.score_windows(interval_width, n_components, starts=candidates, folds=[fold])
+
+        def score_all(fold):
+            return engine.score_windows(interval_width, n_components, folds=[fold])
+
+        return self._race(X.shape[1] - interval_width + 1, interval_width, score, self.racing_confidence, score_all)
 
     def reparameterize(self, feature_descriptor: FeatureDescriptor):
         n_intervals_to_select, interval_width = feature_descriptor.get_configuration_for(self)
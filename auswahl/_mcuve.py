@@ -1,13 +1,16 @@
 from typing import Union, List, Dict
 
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils import check_random_state
 from sklearn.utils.validation import check_is_fitted, check_scalar
 
-from .util import get_coef_from_pls
+from .util._kernel_pls import _kernel_pls1
 from ._base import PointSelector
 
+_SUBSET_CHUNK_ELEMENTS = 2 ** 22
+
 
 class MCUVE(PointSelector):
     """Feature selection with Monte Carlo Uninformative Variable Elimination.
@@ -36,10 +39,20 @@ class MCUVE(PointSelector):
     random_state : int or numpy.random.RandomState, default=None
         Seed for the random subset sampling. Pass an int for reproducible output across function calls.
 
+    n_jobs : int, default=1
+        Number of threads fitting chunks of the PLS models of the random subsets in parallel.
+
+    store_coefs : bool, default=True
+        Whether the regression coefficients of all PLS models are kept in the attribute coefs_. Otherwise, only the
+        mean and variance of the coefficients are accumulated while the models are fitted.
+
     Attributes
     ----------
     coefs_ : ndarray of shape (n_subsets, n_features)
-        Fitted regression coefficients of the <n_subsets> PLS models.
+        Fitted regression coefficients of the <n_subsets> PLS models. Only available if store_coefs is True.
+
+    memory_saved_ : int
+        Number of bytes, which were not allocated for coefs_ because store_coefs is False.
 
     stability_ : ndarray of shape (n_features,)
         Computed stability value for each feature. While these attribute contains the signed stability values, MC-UVE
@@ -73,29 +86,50 @@ class MCUVE(PointSelector):
                  pls: PLSRegression = None,
                  n_cv_folds: int = 5,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 random_state: Union[int, np.random.RandomState] = None):
-        super().__init__(n_features_to_select, model_hyperparams, n_cv_folds, random_state)
+                 random_state: Union[int, np.random.RandomState] = None,
+                 n_jobs: int = 1,
+                 store_coefs: bool = True):
+        super().__init__(n_features_to_select, model_hyperparams, n_cv_folds, random_state, n_jobs)
         self.n_subsets = n_subsets
         self.n_samples_per_subset = n_samples_per_subset
         self.pls = pls
+        self.store_coefs = store_coefs
 
     def _fit(self, X, y, n_features_to_select):
+        # coefficients of a previous fit must not outlive a refit with store_coefs=False
+        if hasattr(self, 'coefs_'):
+            del self.coefs_
         _, model = self.evaluate(X, y, self.pls, do_cv=False)
         random_state = check_random_state(self.random_state)
         self._check_n_subsets()
         n_samples_per_subset = self._check_n_samples_per_subset(X)
 
+        # the subsets are drawn upfront, such that they do not depend on the distribution of the work
         n_samples = X.shape[0]
-        coefs = []
-        for i in range(self.n_subsets):
-            idx = random_state.permutation(n_samples)[:n_samples_per_subset]
-            X_i, y_i = X[idx], y[idx]
-
-            model.fit(X_i, y_i)
-            coefs.append(get_coef_from_pls(model).squeeze())
-
-        self.coefs_ = np.array(coefs)
-        self.stability_ = self.coefs_.mean(axis=0) / self.coefs_.std(axis=0)
+        subsets = np.array([random_state.permutation(n_samples)[:n_samples_per_subset]
+                            for i in range(self.n_subsets)])
+
+        chunk_size = max(1, min(_SUBSET_CHUNK_ELEMENTS // (n_samples_per_subset * X.shape[1]),
+                                int(np.ceil(self.n_subsets / effective_n_jobs(self.n_jobs)))))
+        chunks = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(_subset_moments)(X, y, subsets[start:start + chunk_size], model.n_components, model.scale,
+                                     self.store_coefs)
+            for start in range(0, self.n_subsets, chunk_size))
+
+        # merge the moments of the chunks in the order of the subsets (Chan et al.)
+        count, mean, m2 = 0, np.zeros(X.shape[1]), np.zeros(X.shape[1])
+        for chunk_count, chunk_mean, chunk_m2, _ in chunks:
+            delta = chunk_mean - mean
+            mean = mean + delta * chunk_count / (count + chunk_count)
+            m2 = m2 + chunk_m2 + delta ** 2 * count * chunk_count / (count + chunk_count)
+            count += chunk_count
+
+        if self.store_coefs:
+            self.coefs_ = np.concatenate([coefs for _, _, _, coefs in chunks])
+            self.memory_saved_ = 0
+        else:
+            self.memory_saved_ = self.n_subsets * X.shape[1] * np.dtype(float).itemsize
+        self.stability_ = mean / np.sqrt(m2 / count)
 
         selected_idx = np.argsort(abs(self.stability_))[-n_features_to_select:]
         self.support_ = np.zeros(X.shape[1], dtype=bool)
@@ -121,3 +155,44 @@ class MCUVE(PointSelector):
                              f'or a float in (0, 1); got {self.n_samples_per_subset}')
 
         return n_samples_per_subset
+
+
+def _subset_coefs(X, y, subsets, n_components, scale):
+    """Regression coefficients of PLS models fitted on random subsets of the samples. The models of all subsets are
+    fitted at once with the kernel PLS algorithm (see :func:`~auswahl.util.kernel_pls1`). The products with the
+    cross-product matrices are evaluated via the data of the subsets, such that no (n_features, n_features) matrices
+    are formed.
+
+    Returns
+    -------
+    coefs: np.ndarray of shape (n_subsets, n_features)
+        Coefficients of the models w.r.t. the scaled features, as provided by the coef_ attribute of PLSRegression.
+    """
+    X_subsets = X[subsets].astype(float)
+    y_subsets = y[subsets].astype(float)
+    X_subsets -= X_subsets.mean(axis=1, keepdims=True)
+    y_subsets -= y_subsets.mean(axis=1, keepdims=True)
+    y_std = np.ones((len(subsets),))
+    if scale:
+        x_std = X_subsets.std(axis=1, ddof=1, keepdims=True)
+        x_std[x_std == 0.0] = 1.0
+        X_subsets /= x_std
+        y_std = y_subsets.std(axis=1, ddof=1)
+        y_std[y_std == 0.0] = 1.0
+        y_subsets /= y_std[:, None]
+
+    def xtx_product(r):
+        return np.einsum('bnk,bn->bk', X_subsets, np.einsum('bnk,bk->bn', X_subsets, r))
+
+    xty = np.einsum('bnk,bn->bk', X_subsets, y_subsets)
+    return _kernel_pls1(xtx_product, xty, n_components)[:, -1] * y_std[:, None]
+
+
+def _subset_moments(X, y, subsets, n_components, scale, return_coefs):
+    """Number, mean and sum of squared deviations from the mean of the coefficients of the PLS models fitted on
+    random subsets of the samples. The coefficients are returned as well, if return_coefs is True (otherwise None).
+    """
+    coefs = _subset_coefs(X, y, subsets, n_components, scale)
+    mean = coefs.mean(axis=0)
+    m2 = np.sum((coefs - mean) ** 2, axis=0)
+    return len(subsets), mean, m2, coefs if return_coefs else None
@@ -6,7 +6,9 @@ from sklearn.utils.validation import check_is_fitted
 
 from ._base import FeatureDescriptor
 from ._base import IntervalSelector, Convertible, SpectralSelector
-from .util import optimize_intervals
+from .util import LRUCache, fingerprint, optimize_intervals
+
+_SCORE_CACHE_SIZE = 16
 
 
 class PseudoIntervalSelector(IntervalSelector):
@@ -14,6 +16,10 @@ class PseudoIntervalSelector(IntervalSelector):
     IntervalSelector. Given the feature scores calculated by the wrapped :class:`~auswahl.PointSelector`, an optimal
     (max total score) interval placement is calculated using :func:`~auswahl.optimize_intervals`.
 
+    The feature scores are expected not to depend on the number of features to select of the wrapped selector. They
+    are cached for the training data, such that refits after a reparameterization of the number and width of the
+    intervals only recompute the interval placement and the final model.
+
     Parameters
     ----------
     selector: Convertible
@@ -41,13 +47,33 @@ class PseudoIntervalSelector(IntervalSelector):
 
     def _fit(self, X, y, n_intervals_to_select, interval_width):
         self.selector.reparameterize(FeatureDescriptor(key=(n_intervals_to_select, interval_width)))
-        self.selector.fit(X, y)
-        scores = self.selector.get_feature_scores()
+        scores = self._feature_scores(X, y)
         _, interval_starts = optimize_intervals(n_intervals_to_select, interval_width, feature_scores=scores)
         intervals = np.reshape(interval_starts, (-1, 1)) + np.arange(interval_width).reshape((1, -1))
         self.support_ = np.zeros((X.shape[1],), dtype=bool)
         self.support_[intervals.flatten()] = 1
-        self.best_model_ = self.selector.get_best_estimator()
+        _, self.best_model_ = self.evaluate(X[:, self.support_], y, self.selector.get_best_estimator(), do_cv=False)
+
+    def _feature_scores(self, X, y):
+        """Retrieve the feature scores of the wrapped selector fitted on the data. The scores are cached for the data
+        and the parameters of the wrapped selector, except for the number of features to select.
+        """
+        params = self.selector.get_params()
+        if isinstance(params.get('random_state'), RandomState):  # the scores change with the state of the generator
+            self.selector.fit(X, y)
+            return self.selector.get_feature_scores()
+
+        key = (fingerprint(X, y), type(self.selector).__name__,
+               repr(sorted((name, value) for name, value in params.items()
+                           if name not in ('n_features_to_select', 'n_jobs'))))
+        if getattr(self, '_score_cache', None) is None:
+            self._score_cache = LRUCache(maxsize=_SCORE_CACHE_SIZE)
+        scores = self._score_cache.get(key)
+        if scores is None:
+            self.selector.fit(X, y)
+            scores = np.array(self.selector.get_feature_scores())
+            self._score_cache.put(key, scores)
+        return scores
 
     def reparameterize(self, feature_descriptor: FeatureDescriptor):
         self.n_intervals_to_select, self.interval_width = feature_descriptor.get_configuration_for(self)
@@ -58,3 +84,7 @@ class PseudoIntervalSelector(IntervalSelector):
 
     def rethread(self, n_jobs: int):
         self.selector.rethread(n_jobs)
+
+    def reset_caches(self):
+        super().reset_caches()
+        self.selector.reset_caches()
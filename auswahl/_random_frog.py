@@ -3,6 +3,7 @@ from typing import Union, Dict, List
 from warnings import warn
 
 import numpy as np
+from joblib import Parallel, delayed
 from sklearn import clone
 from sklearn.base import BaseEstimator
 from sklearn.cross_decomposition import PLSRegression
@@ -28,26 +29,95 @@ class _RandomFrog(SpectralSelector, BaseEstimator, metaclass=ABCMeta):
                 subset_expansion_factor: float = 3,
                 acceptance_factor: float = 0.1,
                 pls: PLSRegression = None,
-                random_state: Union[int, np.random.RandomState] = None):
+                random_state: Union[int, np.random.RandomState] = None,
+                n_chains: int = 1,
+                convergence_interval: int = None,
+                convergence_patience: int = 5):
         # Perform parameter checks
         self._check_n_iterations(n_iterations)
+        self._check_n_chains(n_chains, n_iterations)
+        self._check_convergence(convergence_interval, convergence_patience)
         self._check_subset_expansion_factor(subset_expansion_factor)
         self._check_acceptance_factor(acceptance_factor)
 
         n_initial_features = self._check_n_initial_features(X, n_initial_features)
         variance_factor = self._check_variance_factor(variance_factor)
         random_state = check_random_state(random_state)
+        pls = PLSRegression() if pls is None else pls
+        chain_kwargs = dict(n_features=n_features, n_initial_features=n_initial_features,
+                            variance_factor=variance_factor, subset_expansion_factor=subset_expansion_factor,
+                            acceptance_factor=acceptance_factor, pls=pls, n_features_to_select=n_features_to_select,
+                            convergence_interval=convergence_interval, convergence_patience=convergence_patience)
+
+        cache = getattr(self, '_evaluation_cache', None)
+        counts = (cache.hits, cache.misses) if cache is not None else None
+        if n_chains == 1:
+            chains = [self._run_chain(X, y, n_iterations=n_iterations, random_state=random_state, **chain_kwargs)]
+        else:
+            # the chains are seeded upfront and split the iterations evenly, such that the outcome does not depend
+            # on the distribution of the chains to the workers
+            seeds = random_state.randint(np.iinfo(np.int32).max, size=n_chains)
+            lengths = np.full(n_chains, n_iterations // n_chains)
+            lengths[:n_iterations % n_chains] += 1
+            chains = Parallel(n_jobs=self.n_jobs)(
+                delayed(self._run_chain)(X, y, n_iterations=int(length), random_state=np.random.RandomState(seed),
+                                         **chain_kwargs)
+                for seed, length in zip(seeds, lengths))
+
+        if cache is not None:
+            # chains run in worker processes count on copies of the cache
+            cache.hits = counts[0] + sum(hits for *_, hits, _ in chains)
+            cache.misses = counts[1] + sum(misses for *_, misses in chains)
+
+        self.chain_frequencies_ = np.array([frequencies for frequencies, *_ in chains])
+        self.chain_correlation_ = np.atleast_2d(np.corrcoef(self.chain_frequencies_))
+        self.frequencies_ = self.chain_frequencies_.sum(axis=0)
+        self.n_iter_ = sum(n_iter for _, _, n_iter, *_ in chains)
+        self.convergence_trace_ = [trace for _, _, _, trace, *_ in chains]
+
+        pls = chains[-1][1]
+        self.support_ = self._generate_mask_from_frequencies(n_features_to_select)
+        self.best_model_ = pls.fit(self.transform(X), y)
+
+        return self
+
+    def _run_chain(self, X, y, n_features, n_iterations, n_initial_features, variance_factor,
+                   subset_expansion_factor, acceptance_factor, pls, random_state, n_features_to_select,
+                   convergence_interval, convergence_patience):
+        """Run a single Random Frog chain of at most n_iterations steps. If convergence_interval is given, the
+        ranking of the n_features_to_select most frequently selected features is compared every convergence_interval
+        steps and the chain is stopped, once the ranking has not changed for convergence_patience checks.
+
+        Returns
+        -------
+        tuple: np.ndarray of shape (n_features,), PLSRegression, int, np.ndarray, int, int
+            selection frequencies of the features, the estimator of the last step, the number of steps conducted,
+            the fraction of unchanged ranks at each check and the hits and misses of the evaluation cache
+        """
+        cache = getattr(self, '_evaluation_cache', None)
+        counts = (cache.hits, cache.misses) if cache is not None else (0, 0)
 
         # Initialize estimator, feature sets and frequency counter
-        pls = PLSRegression() if pls is None else clone(pls)
+        pls = clone(pls)
         n_components = pls.n_components
 
         all_features = np.arange(n_features)
         selected_features = random_state.choice(n_features, n_initial_features, replace=False)
-        self.frequencies_ = np.zeros(n_features)
+        frequencies = np.zeros(n_features)
+        n_iter, trace, ranking, n_stable = n_iterations, [], None, 0
 
         # Random Frog Iteration
         for i in range(n_iterations):
+            if convergence_interval is not None and i > 0 and i % convergence_interval == 0:
+                previous_ranking = ranking
+                ranking = np.argsort(-frequencies, kind='stable')[:n_features_to_select]
+                if previous_ranking is not None:
+                    trace.append(np.mean(ranking == previous_ranking))
+                    n_stable = n_stable + 1 if trace[-1] == 1 else 0
+                if n_stable >= convergence_patience:
+                    n_iter = i
+                    break
+
             n_selected_features = len(selected_features)
             n_candidate_features = random_state.normal(n_selected_features, n_selected_features * variance_factor)
             n_candidate_features = np.clip(round(n_candidate_features), n_components, n_features)
@@ -64,33 +134,31 @@ class _RandomFrog(SpectralSelector, BaseEstimator, metaclass=ABCMeta):
                 features_to_explore = np.union1d(selected_features, additional_features)
             else:
                 # Skip step
-                self.frequencies_[selected_features] += 1
+                frequencies[selected_features] += 1
                 continue
 
             # Determine the candidate feature selection
-            _, pls = self.evaluate(X[:, self._idx_to_mask(features_to_explore)], y, pls)
+            _, pls = self.evaluate(X, y, pls, do_cv=False, features=self._idx_to_mask(features_to_explore))
             absolute_coefficients = self._get_feature_score_from_model(pls, features_to_explore)
             selection_idx = np.argsort(absolute_coefficients)[-n_candidate_features:]
             candidate_features = features_to_explore[selection_idx]
 
             # Score the current feature selection and the candidate feature selection
             pls.n_components = min(pls.n_components, len(selected_features))
-            selected_features_score, _ = self.evaluate(X=X[:, self._idx_to_mask(selected_features)], y=y, model=pls)
-
+            selected_features_score, candidate_features_score = self.evaluate_many(
+                X, y, [self._idx_to_mask(selected_features), self._idx_to_mask(candidate_features)], pls)
             pls.n_components = min(pls.n_components, len(candidate_features))
-            candidate_features_score, _ = self.evaluate(X=X[:, self._idx_to_mask(candidate_features)], y=y, model=pls)
 
             # Update the feature selection
             if candidate_features_score >= selected_features_score:
                 selected_features = candidate_features
             elif random_state.random() < acceptance_factor * (selected_features_score / candidate_features_score):
                 selected_features = candidate_features
-            self.frequencies_[selected_features] += 1
-
-        self.support_ = self._generate_mask_from_frequencies(n_features_to_select)
-        self.best_model_ = pls.fit(self.transform(X), y)
+            frequencies[selected_features] += 1
 
-        return self
+        if cache is not None:
+            counts = (cache.hits - counts[0], cache.misses - counts[1])
+        return frequencies, pls, n_iter, np.array(trace), *counts
 
     @abstractmethod
     def _idx_to_mask(self, feature_idx):
@@ -108,6 +176,16 @@ class _RandomFrog(SpectralSelector, BaseEstimator, metaclass=ABCMeta):
     def _check_n_iterations(n_iterations):
         check_scalar(n_iterations, name='n_iterations', target_type=int, min_val=1)
 
+    @staticmethod
+    def _check_n_chains(n_chains, n_iterations):
+        check_scalar(n_chains, name='n_chains', target_type=int, min_val=1, max_val=n_iterations)
+
+    @staticmethod
+    def _check_convergence(convergence_interval, convergence_patience):
+        if convergence_interval is not None:
+            check_scalar(convergence_interval, name='convergence_interval', target_type=int, min_val=1)
+        check_scalar(convergence_patience, name='convergence_patience', target_type=int, min_val=1)
+
     @staticmethod
     def _check_n_initial_features(X, n_initial_features):
         n_features = X.shape[1]
@@ -178,11 +256,24 @@ class RandomFrog(PointSelector, _RandomFrog):
         acceptance_factor with the relative decrease of the cross-validated performance score.
         This variable is called η in the original publication.
 
+    n_chains : int, default=1
+        Number of independently seeded chains, which split the n_iterations iterations evenly and are run in parallel
+        processes. The selection frequencies of the chains are summed up. With n_jobs=1, the chains share the evaluation
+        cache. Otherwise, each worker process evaluates on its own copy of the cache.
+
+    convergence_interval : int, default=None
+        Number of iterations between two checks of the ranking of the n_features_to_select most frequently selected
+        features. If None, all n_iterations iterations are conducted. Otherwise, a chain is stopped early, once the
+        ranking has not changed for convergence_patience consecutive checks.
+
+    convergence_patience : int, default=5
+        Number of consecutive checks without a change of the ranking after which a chain is stopped.
+
     n_cv_folds : int, default=5
         Number of cross validation folds used to evaluate the features.
 
     n_jobs : int, default=1
-        Number of parallel processes used to fit the PLS models on the cross-validation splits.
+        Number of parallel processes used to run the chains and to fit the PLS models on the cross-validation splits.
 
     pls : PLSRegression, default=None
         Estimator instance of the :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` class. Use this
@@ -191,11 +282,29 @@ class RandomFrog(PointSelector, _RandomFrog):
     random_state : int or numpy.random.RandomState, default=None
         Seed for the random subset sampling. Pass an int for reproducible output across function calls.
 
+    evaluation_cache_size : int, default=None
+        Maximal number of cross-validation scores of feature subsets cached during the fit. The unchanged feature
+        subset is scored again in every iteration, which is answered from the cache if enabled.
+
     Attributes
     ----------
     frequencies_ : ndarray of shape (n_features,)
         Number of times each feature has been selected after all iterations.
 
+    chain_frequencies_ : ndarray of shape (n_chains, n_features)
+        Number of times each feature has been selected in each chain.
+
+    chain_correlation_ : ndarray of shape (n_chains, n_chains)
+        Pearson correlation coefficients between the selection frequencies of the chains. High correlations indicate
+        that the chains agree on the ranking of the features.
+
+    n_iter_ : int
+        Number of iterations conducted by all chains.
+
+    convergence_trace_ : list of ndarray
+        Fraction of the ranks of the n_features_to_select most frequently selected features that did not change
+        since the previous check, for each check of each chain. Empty, if convergence_interval is None.
+
     support_ : ndarray of shape (n_features,)
         Mask of selected features.
 
@@ -225,18 +334,25 @@ class RandomFrog(PointSelector, _RandomFrog):
                  variance_factor: float = 0.3,
                  subset_expansion_factor: float = 3,
                  acceptance_factor: float = 0.1,
+                 n_chains: int = 1,
+                 convergence_interval: int = None,
+                 convergence_patience: int = 5,
                  pls: PLSRegression = None,
                  n_cv_folds: int = 5,
                  n_jobs: int = 1,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 random_state: Union[int, np.random.RandomState] = None):
+                 random_state: Union[int, np.random.RandomState] = None,
+                 evaluation_cache_size: int = None):
         super().__init__(n_features_to_select, model_hyperparams=model_hyperparams,
-                         random_state=random_state, n_jobs=n_jobs)
+                         random_state=random_state, n_jobs=n_jobs, evaluation_cache_size=evaluation_cache_size)
         self.n_iterations = n_iterations
         self.n_initial_features = n_initial_features
         self.variance_factor = variance_factor
         self.subset_expansion_factor = subset_expansion_factor
         self.acceptance_factor = acceptance_factor
+        self.n_chains = n_chains
+        self.convergence_interval = convergence_interval
+        self.convergence_patience = convergence_patience
         self.n_cv_folds = n_cv_folds
         self.pls = pls
 
@@ -251,7 +367,10 @@ class RandomFrog(PointSelector, _RandomFrog):
                                subset_expansion_factor=self.subset_expansion_factor,
                                acceptance_factor=self.acceptance_factor,
                                pls=self.pls,
-                               random_state=self.random_state)
+                               random_state=self.random_state,
+                               n_chains=self.n_chains,
+                               convergence_interval=self.convergence_interval,
+                               convergence_patience=self.convergence_patience)
 
     def _idx_to_mask(self, feature_idx):
         mask = np.zeros(self.n_features_, dtype=bool)
@@ -312,11 +431,24 @@ class IntervalRandomFrog(IntervalSelector, _RandomFrog):
         acceptance_factor with the relative decrease of the cross-validated performance score.
         This variable is called η in the original publication.
 
+    n_chains : int, default=1
+        Number of independently seeded chains, which split the n_iterations iterations evenly and are run in parallel
+        processes. The selection frequencies of the chains are summed up. With n_jobs=1, the chains share the evaluation
+        cache. Otherwise, each worker process evaluates on its own copy of the cache.
+
+    convergence_interval : int, default=None
+        Number of iterations between two checks of the ranking of the n_intervals_to_select most frequently selected
+        intervals. If None, all n_iterations iterations are conducted. Otherwise, a chain is stopped early, once the
+        ranking has not changed for convergence_patience consecutive checks.
+
+    convergence_patience : int, default=5
+        Number of consecutive checks without a change of the ranking after which a chain is stopped.
+
     n_cv_folds : int, default=5
         Number of cross validation folds used to evaluate the features.
 
     n_jobs : int, default=1
-        Number of parallel processes used to fit the PLS models on the cross-validation splits.
+        Number of parallel processes used to run the chains and to fit the PLS models on the cross-validation splits.
 
     pls : PLSRegression, default=None
         Estimator instance of the :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` class. Use this
@@ -325,11 +457,29 @@ class IntervalRandomFrog(IntervalSelector, _RandomFrog):
     random_state : int or numpy.random.RandomState, default=None
         Seed for the random subset sampling. Pass an int for reproducible output across function calls.
 
+    evaluation_cache_size : int, default=None
+        Maximal number of cross-validation scores of interval subsets cached during the fit. The unchanged interval
+        subset is scored again in every iteration, which is answered from the cache if enabled.
+
     Attributes
     ----------
     frequencies_ : ndarray of shape (n_features,)
         Number of times each interval has been selected after all iterations.
 
+    chain_frequencies_ : ndarray of shape (n_chains, n_features)
+        Number of times each interval has been selected in each chain.
+
+    chain_correlation_ : ndarray of shape (n_chains, n_chains)
+        Pearson correlation coefficients between the selection frequencies of the chains. High correlations indicate
+        that the chains agree on the ranking of the intervals.
+
+    n_iter_ : int
+        Number of iterations conducted by all chains.
+
+    convergence_trace_ : list of ndarray
+        Fraction of the ranks of the n_intervals_to_select most frequently selected intervals that did not change
+        since the previous check, for each check of each chain. Empty, if convergence_interval is None.
+
     support_ : ndarray of shape (n_features,)
         Mask of selected intervals.
 
@@ -361,19 +511,26 @@ class IntervalRandomFrog(IntervalSelector, _RandomFrog):
                  variance_factor: float = 0.3,
                  subset_expansion_factor: float = 3,
                  acceptance_factor: float = 0.1,
+                 n_chains: int = 1,
+                 convergence_interval: int = None,
+                 convergence_patience: int = 5,
                  n_cv_folds: int = 5,
                  n_jobs: int = 1,
                  pls: PLSRegression = None,
                  model_hyperparams: Union[Dict, List[Dict]] = None,
-                 random_state: Union[int, np.random.RandomState] = None):
+                 random_state: Union[int, np.random.RandomState] = None,
+                 evaluation_cache_size: int = None):
         super().__init__(n_intervals_to_select, interval_width,
                          model_hyperparams=model_hyperparams, n_cv_folds=n_cv_folds,
-                         random_state=random_state, n_jobs=n_jobs)
+                         random_state=random_state, n_jobs=n_jobs, evaluation_cache_size=evaluation_cache_size)
         self.n_iterations = n_iterations
         self.n_initial_intervals = n_initial_intervals
         self.variance_factor = variance_factor
         self.subset_expansion_factor = subset_expansion_factor
         self.acceptance_factor = acceptance_factor
+        self.n_chains = n_chains
+        self.convergence_interval = convergence_interval
+        self.convergence_patience = convergence_patience
         self.n_cv_folds = n_cv_folds
         self.pls = pls
 
@@ -389,13 +546,18 @@ class IntervalRandomFrog(IntervalSelector, _RandomFrog):
                                subset_expansion_factor=self.subset_expansion_factor,
                                acceptance_factor=self.acceptance_factor,
                                pls=self.pls,
-                               random_state=self.random_state)
+                               random_state=self.random_state,
+                               n_chains=self.n_chains,
+                               convergence_interval=self.convergence_interval,
+                               convergence_patience=self.convergence_patience)
 
     def _idx_to_mask(self, feature_idx):
-        mask = np.zeros(self.n_windows_ + self.interval_width_ - 1, dtype=bool)
-        for idx in feature_idx:
-            mask[idx:idx + self.interval_width_] = 1
-        return mask
+        # count the intervals covering each feature by the difference of the interval starts and ends
+        n_features = self.n_windows_ + self.interval_width_ - 1
+        feature_idx = np.asarray(feature_idx, dtype=int)
+        coverage = np.bincount(feature_idx, minlength=n_features + 1) - \
+            np.bincount(feature_idx + self.interval_width_, minlength=n_features + 1)
+        return np.cumsum(coverage[:n_features]) > 0
 
     def _generate_mask_from_frequencies(self, n_features_to_select):
         mask = np.zeros(len(self.frequencies_) + self.interval_width_ - 1, dtype=bool)
@@ -409,7 +571,9 @@ class IntervalRandomFrog(IntervalSelector, _RandomFrog):
         return mask
 
     def _get_feature_score_from_model(self, pls, feature_idx):
-        scores = np.zeros(self.n_windows_ + self.interval_width_ - 1)
-        scores[self._idx_to_mask(feature_idx)] = abs(get_coef_from_pls(pls).squeeze())
-        scores = [sum(scores[idx:idx + self.interval_width_]) for idx in feature_idx]
-        return scores
+        # sum the absolute coefficients of each interval as the difference of prefix sums
+        feature_idx = np.asarray(feature_idx, dtype=int)
+        scores = np.zeros(self.n_windows_ + self.interval_width_)
+        scores[1:][self._idx_to_mask(feature_idx)] = abs(get_coef_from_pls(pls).squeeze())
+        scores = np.cumsum(scores)
+        return scores[feature_idx + self.interval_width_] - scores[feature_idx]
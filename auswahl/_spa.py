@@ -1,11 +1,15 @@
 from typing import Union, List, Dict
 
 import numpy as np
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils.validation import check_is_fitted
 
 from ._base import PointSelector
+from .util import LRUCache, fingerprint
+
+_CHAIN_CHUNK_ELEMENTS = 2 ** 20
+_SPA_CACHE_SIZE = 16
 
 
 class SPA(PointSelector):
@@ -31,11 +35,30 @@ class SPA(PointSelector):
     n_jobs : int, default=1
         Number of jobs used for parallel calculation of SPA
 
+    racing_confidence : float, default=None
+        If not None, candidates are cross validated fold by fold and candidates performing significantly worse than
+        the current best candidate at this confidence level (for instance 0.95) are not evaluated on the remaining
+        folds. Racing is not combined with a hyperparameter optimization (model_hyperparams).
+
+    score_prefixes : bool, default=False
+        If True, every prefix of length 1 to n_features_to_select of the chains is cross validated and the best
+        feature set of any length is selected. Otherwise, only chains of length n_features_to_select are scored.
+
     Attributes
     ----------
     support_ : ndarray fo shape (n_features,)
         Mask of selected features
 
+    prefix_scores_ : ndarray of shape (n_features_to_select,)
+        Best cross validation score of the chains of length 1 to n_features_to_select. Only available if
+        score_prefixes is True.
+
+    Notes
+    -----
+    The chains of a data set and the scores of their prefixes are cached by the selector. Since the chain of length
+    k is a prefix of the chain of length k + 1, refitting the selector on the same data with an equal or smaller
+    n_features_to_select does neither repeat the projections nor the cross validation.
+
     References
     ----------
     .. [1] Mário César Ugulino Araújo,Teresa Cristina Bezerra Saldanha, Roberto Kawakami Harrop Galvao,
@@ -60,44 +83,128 @@ class SPA(PointSelector):
                  n_cv_folds: int = 5,
                  pls: PLSRegression = None,
                  n_jobs: int = 1,
-                 model_hyperparams: Union[Dict, List[Dict]] = None):
+                 model_hyperparams: Union[Dict, List[Dict]] = None,
+                 racing_confidence: float = None,
+                 score_prefixes: bool = False):
         
         super().__init__(n_features_to_select, model_hyperparams, n_cv_folds, n_jobs=n_jobs)
         
         self.pls = pls
+        self.racing_confidence = racing_confidence
+        self.score_prefixes = score_prefixes
 
-    def _fit_spa(self, X, y, n_features_to_select, pls, seed):
-
-        wavelengths = [seed]
-        current = X[:, seed:seed + 1]
-        rest = np.delete(X, seed, 1)
-
-        wavelength_map = np.arange(X.shape[1])
-        wavelength_map = np.delete(wavelength_map, seed)
-
-        for j in range(n_features_to_select - 1):
-            current = current / np.linalg.norm(current, ord=2)
-            projections = rest - current @ np.transpose(np.transpose(rest) @ current)
-            projection_distances = np.linalg.norm(projections, ord=2, axis=0)
+    def _fit(self, X, y, n_features_to_select):
+        chains = self._chains(X, n_features_to_select)
+        lengths = np.arange(1, n_features_to_select + 1) if self.score_prefixes else np.array([n_features_to_select])
+        scores = self._chain_scores(X, y, chains, lengths)
 
-            next_index = np.argmax(projection_distances)
-            current = projections[:, next_index:next_index + 1]
-            rest = np.delete(projections, next_index, 1)
+        # the shortest length and the first seed are preferred among equally scored chains
+        length, seed = np.unravel_index(np.argmax(scores), scores.shape)
+        self.support_ = np.zeros(X.shape[1]).astype('bool')
+        self.support_[chains[seed, :lengths[length]]] = True
+        if self.score_prefixes:
+            self.prefix_scores_ = scores.max(axis=1)
+        _, self.best_model_ = self.evaluate(X[:, self.support_], y, self.pls, do_cv=False)
+
+    def _chains(self, X, n_features_to_select):
+        """Retrieve the chains of all seeds with at least n_features_to_select features. The chains are cached for
+        the data and extended if longer chains are requested.
+        """
+        if getattr(self, '_chain_cache', None) is None:
+            self._chain_cache = LRUCache(maxsize=_SPA_CACHE_SIZE)
+        key = fingerprint(X)
+        chains = self._chain_cache.get(key)
+        if chains is None or chains.shape[1] < n_features_to_select:
+            chains = self._project(X, n_features_to_select)
+            self._chain_cache.put(key, chains)
+        return chains
+
+    def _chain_scores(self, X, y, chains, lengths):
+        """Cross validation scores of the chain prefixes of the given lengths of all seeds. The scores are cached for
+        the data and the model configuration.
+        """
+        if getattr(self, '_score_cache', None) is None:
+            self._score_cache = LRUCache(maxsize=_SPA_CACHE_SIZE)
+        key = (fingerprint(X, y), self.n_cv_folds, repr(self.model_hyperparams), self.racing_confidence,
+               None if self.pls is None else repr(sorted(self.pls.get_params().items())))
+        cached = self._score_cache.get(key)
+        if cached is None:
+            cached = {}
+            self._score_cache.put(key, cached)
+
+        for length in lengths:
+            if length not in cached:
+                # chains of different seeds frequently converge to the same set of features
+                feature_sets, inverse = np.unique(np.sort(chains[:, :length], axis=1), axis=0, return_inverse=True)
+                cached[length] = self._score_sets(X, y, feature_sets)[inverse.reshape(-1)]
+        return np.stack([cached[length] for length in lengths])
+
+    def _score_sets(self, X, y, feature_sets):
+        pls = PLSRegression() if self.pls is None else self.pls
+        n_components = self._racing_components(X, y, pls, feature_sets.shape[1], self.racing_confidence)
+        if n_components is None:
+            return self.evaluate_many(X, y, feature_sets, pls)
+
+        engine = self._get_cv_engine(X, y, pls)
+
+        def score(candidates, fold):
+            return engine.score_batch(feature_sets[candidates], n_components, folds=[fold])
+
+        return self._race(len(feature_sets), feature_sets.shape[1], score, self.racing_confidence)
+
+    def _project(self, X, n_features_to_select):
+        """Calculate the projection chains of all seed features. The chunks of seeds are distributed across n_jobs
+        threads.
+        """
+        n_samples, n_seeds = X.shape
+        chunk_size = max(1, min(_CHAIN_CHUNK_ELEMENTS // (n_samples * n_seeds),
+                                int(np.ceil(n_seeds / effective_n_jobs(self.n_jobs)))))
+        chains = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(_spa_chains)(X, np.arange(start, min(start + chunk_size, n_seeds)), n_features_to_select)
+            for start in range(0, n_seeds, chunk_size))
+        return np.concatenate(chains)
+
+
+def _spa_chains(X, seeds, n_features_to_select):
+    """Successive projections of a batch of seed features carried out on the data.
+
+    Each chain projects all features onto the orthogonal complement of its current feature (classical Gram-Schmidt on
+    the columns of X, as in the per-seed formulation of the algorithm) and selects the feature with the largest
+    projection. The projections are computed on the data rather than on the Gram matrix X^T X, since the latter
+    squares the condition number of the highly collinear spectra. Selected features are excluded by masking.
 
-            wavelengths.append(wavelength_map[next_index])
-            wavelength_map = np.delete(wavelength_map, next_index)
+    Parameters
+    ----------
+    X: np.ndarray of shape (n_samples, n_features)
+        Spectral data.
 
-        score, model = self.evaluate(X[:, wavelengths], y, self.pls)
-        return score, model, wavelengths
+    seeds: np.ndarray of shape (n_seeds,)
+        Initial features of the chains.
 
-    def _fit(self, X, y, n_features_to_select):
-        candidates = Parallel(n_jobs=self.n_jobs)(delayed(self._fit_spa)(X,
-                                                  y,
-                                                  n_features_to_select,
-                                                  self.pls,
-                                                  i) for i in range(X.shape[-1]))
-        score, model, opt_set = max(candidates, key=lambda x: x[0])
-        self.support_ = np.zeros(X.shape[1]).astype('bool')
-        self.support_[opt_set] = True
-        self.best_model_ = model
+    n_features_to_select: int
+        Length of the chains.
 
+    Returns
+    -------
+    chains: np.ndarray of shape (n_seeds, n_features_to_select)
+        Features of each chain in the order of their selection.
+    """
+    n_seeds = len(seeds)
+    batch = np.arange(n_seeds)
+    chains = np.empty((n_seeds, n_features_to_select), dtype=int)
+    chains[:, 0] = seeds
+    selected = np.zeros((n_seeds, X.shape[1]), dtype=bool)
+    selected[batch, seeds] = True
+
+    projections = np.repeat(np.asarray(X, dtype=float)[None], n_seeds, axis=0)
+    current = projections[batch, :, seeds]
+    for j in range(n_features_to_select - 1):
+        current = current / np.linalg.norm(current, ord=2, axis=1, keepdims=True)
+        projections -= current[:, :, None] * np.matmul(current[:, None, :], projections)
+        distances = np.linalg.norm(projections, ord=2, axis=1)
+
+        next_index = np.argmax(np.where(selected, -np.inf, distances), axis=1)
+        chains[:, j + 1] = next_index
+        selected[batch, next_index] = True
+        current = projections[batch, :, next_index]
+    return chains
@@ -1,11 +1,15 @@
+from functools import partial
 from typing import Union, Dict, List
 
 import numpy as np
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.cross_decomposition import PLSRegression
 from sklearn.utils import check_random_state, check_scalar
 
-from ._base import PointSelector
+from ._base import PointSelector, _EVALUATION_CHUNK_ELEMENTS
+
+# upper bound of the number of random keys drawn at once to order the submodels of a block of features
+_SAMPLING_BLOCK_ELEMENTS = 2 ** 20
 
 
 class VISSA(PointSelector):
@@ -42,6 +46,16 @@ class VISSA(PointSelector):
     n_jobs : int, default=1
         Number of parallel threads to calculate VISSA
 
+    evaluation_cache_size : int, default=None
+        Maximal number of cross-validation scores of submodels cached during the fit. Identical submodels sampled
+        repeatedly are scored only once, if enabled.
+
+    mask_chunk_size : int, default=None
+        Number of submodels, whose sampling masks are generated and scored together. If given, the workers generate
+        the masks of their chunks from a seed drawn for each chunk instead of sharing a single sampling matrix of all
+        submodels, and return only the scores and the bit-packed masks of the best submodels of their chunks. This
+        bounds the memory for very wide spectra. The outcome depends on mask_chunk_size, but not on n_jobs.
+
     Attributes
     ----------
     frequency_ : ndarray of shape (n_features,)
@@ -78,53 +92,52 @@ class VISSA(PointSelector):
                  model_hyperparams: Union[Dict, List[Dict]] = None,
                  n_cv_folds: int = 5,
                  random_state: Union[int, np.random.RandomState] = None,
-                 n_jobs: int = 1):
+                 n_jobs: int = 1,
+                 evaluation_cache_size: int = None,
+                 mask_chunk_size: int = None):
         super().__init__(n_features_to_select,
                          model_hyperparams=model_hyperparams,
                          n_cv_folds=n_cv_folds,
                          random_state=random_state,
-                         n_jobs=n_jobs)
+                         n_jobs=n_jobs,
+                         evaluation_cache_size=evaluation_cache_size)
         self.pls = pls
         self.n_submodels = n_submodels
         self.ratio_submodel_selection = ratio_submodel_selection
         self.max_iter = max_iter
-
-    def _fit_model_on_subset(self, X, y, mask, model):
-        if mask.sum() < 1:
-            return -np.inf
-        else:
-            return self.evaluate(X[:, mask], y, model)[0]
+        self.mask_chunk_size = mask_chunk_size
 
     def _fit(self, X, y, n_features_to_select):
         self._check_n_submodels()
         self._check_ratio_submodel_selection()
         self._check_max_iter()
+        self._check_mask_chunk_size()
         random_state = check_random_state(self.random_state)
 
         n_best_models = int(self.ratio_submodel_selection * self.n_submodels)
         n_best_models = np.clip(n_best_models, 2, self.n_submodels)
         n_features = X.shape[1]
 
-        selection_frequency = [self.n_submodels // 2] * n_features
-
-        with Parallel(n_jobs=self.n_jobs) as parallel:
-            last_best_score = -np.inf
-            for i in range(self.max_iter):
-                sampling_mask = np.stack([random_state.permutation([True] * p + [False] * (self.n_submodels - p))
-                                          for p in selection_frequency], axis=1)
-
-                scores = parallel(delayed(self._fit_model_on_subset)(X, y, mask, self.pls)
-                                  for mask in sampling_mask)
-                scores = np.array(scores)
+        selection_frequency = np.full((n_features,), self.n_submodels // 2)
 
+        last_best_score = -np.inf
+        for i in range(self.max_iter):
+            if self.mask_chunk_size is None:
+                sampling_mask = self._sample_submodels(selection_frequency, self.n_submodels, random_state)
+                scores = self._score_submodels(X, y, sampling_mask, self.n_jobs)
                 best_models = np.argsort(scores)[-n_best_models:]
-                new_frequency = (sampling_mask[best_models].mean(axis=0) * self.n_submodels).astype(int)
-                best_score = np.mean(scores[best_models])
+                best_masks = sampling_mask[best_models]
+            else:
+                scores, best_models, best_masks = self._score_chunked_submodels(X, y, selection_frequency,
+                                                                                n_best_models, random_state)
+
+            new_frequency = (best_masks.mean(axis=0) * self.n_submodels).astype(int)
+            best_score = np.mean(scores[best_models])
 
-                if np.isclose(last_best_score, best_score) or (np.sum(new_frequency > 0) < n_features_to_select):
-                    break
-                last_best_score = best_score
-                selection_frequency = new_frequency
+            if np.isclose(last_best_score, best_score) or (np.sum(new_frequency > 0) < n_features_to_select):
+                break
+            last_best_score = best_score
+            selection_frequency = new_frequency
 
         self.n_iter_ = i
         self.frequency_ = selection_frequency
@@ -134,6 +147,93 @@ class VISSA(PointSelector):
         _, self.best_model_ = self.evaluate(X[:, self.support_], y, self.pls, do_cv=False)
         return self
 
+    @staticmethod
+    def _sample_submodels(selection_frequency, n_submodels, random_state):
+        """Weighted binary sampling matrix, in which each feature is contained in as many submodels as given by its
+        selection frequency. The submodels containing a feature are the first ones in a random order of the submodels
+        drawn independently for each feature. The orders are drawn for blocks of features, such that the memory beyond
+        the matrix is bounded.
+        """
+        selection_frequency = np.asarray(selection_frequency)
+        n_features = len(selection_frequency)
+        sampling_mask = np.empty((n_submodels, n_features), dtype=bool)
+        block_size = max(1, _SAMPLING_BLOCK_ELEMENTS // n_submodels)
+        for start in range(0, n_features, block_size):
+            stop = min(start + block_size, n_features)
+            order = np.argsort(random_state.random_sample((n_submodels, stop - start)), axis=0)
+            np.put_along_axis(sampling_mask[:, start:stop], order,
+                              np.arange(n_submodels)[:, None] < selection_frequency[start:stop], axis=0)
+        return sampling_mask
+
+    def _score_chunked_submodels(self, X, y, selection_frequency, n_best_models, random_state):
+        """Score the submodels in chunks of mask_chunk_size submodels. The number of submodels of each chunk containing
+        a feature is drawn upfront (multivariate hypergeometric distribution), such that each chunk generates its
+        sampling masks from its own seed. Only the bit-packed masks of the best submodels of each chunk are returned by
+        the workers, which include the best submodels overall.
+        """
+        n_features = len(selection_frequency)
+        starts = np.arange(0, self.n_submodels, self.mask_chunk_size)
+        lengths = np.diff(np.append(starts, self.n_submodels))
+
+        counts = np.empty((len(starts), n_features), dtype=int)
+        remaining = np.asarray(selection_frequency, dtype=int)
+        for c in range(len(starts) - 1):
+            n_left = self.n_submodels - starts[c]
+            counts[c] = random_state.hypergeometric(remaining, n_left - remaining, lengths[c]) if n_left > lengths[c] \
+                else remaining
+            remaining = remaining - counts[c]
+        counts[-1] = remaining
+        seeds = random_state.randint(np.iinfo(np.int32).max, size=len(starts))
+
+        self._get_cv_engine(X, y, PLSRegression() if self.pls is None else self.pls)  # shared by the workers
+        chunks = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+            delayed(self._score_submodel_chunk)(X, y, counts[c], lengths[c], seeds[c], n_best_models)
+            for c in range(len(starts)))
+
+        scores = np.concatenate([chunk_scores for chunk_scores, _, _ in chunks])
+        candidates = np.concatenate([start + best for start, (_, best, _) in zip(starts, chunks)])
+        packed_masks = np.concatenate([packed for _, _, packed in chunks])
+
+        # ties are resolved by the position of the submodels in both the chunks and overall
+        best_models = np.argsort(scores, kind='stable')[-n_best_models:]
+        best_masks = np.unpackbits(packed_masks[np.isin(candidates, best_models)], axis=1, count=n_features)
+        return scores, best_models, best_masks.astype(bool)
+
+    def _score_submodel_chunk(self, X, y, counts, n_submodels, seed, n_best_models):
+        sampling_mask = self._sample_submodels(counts, n_submodels, np.random.RandomState(seed))
+        scores = self._score_submodels(X, y, sampling_mask, n_jobs=1)
+        best = np.sort(np.argsort(scores, kind='stable')[-n_best_models:])
+        return scores, best, np.packbits(sampling_mask[best], axis=1)
+
+    def _score_submodels(self, X, y, sampling_mask, n_jobs):
+        # the submodels share the statistics of the sampled features and are distinguished by masking
+        pls = PLSRegression() if self.pls is None else self.pls
+        engine = self._get_cv_engine(X, y, pls)
+        grid = self._component_grid(pls)
+        min_size = pls.n_components if grid is None else max(grid)
+        if engine is None or self._engine_components(engine, min_size, pls) is None or \
+                getattr(self, '_evaluation_cache', None) is not None:
+            # the chunk workers evaluate their submodels in their own thread (n_jobs=1)
+            return self._evaluate_many(X, y, sampling_mask, pls, n_jobs)
+
+        features = np.flatnonzero(sampling_mask.any(axis=0))
+        sizes = sampling_mask.sum(axis=1)
+        masked = np.flatnonzero(sizes >= min_size)
+        small = np.flatnonzero((sizes > 0) & (sizes < min_size))
+        scores = np.full((sampling_mask.shape[0],), -np.inf)
+        scores[small] = self._evaluate_many(X, y, sampling_mask[small], pls, n_jobs)
+
+        chunk_size = max(1, min(_EVALUATION_CHUNK_ELEMENTS // (len(features) * min_size),
+                                int(np.ceil(len(masked) / effective_n_jobs(n_jobs)))))
+        chunks = [masked[start:start + chunk_size] for start in range(0, len(masked), chunk_size)]
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self._engine_scores)(engine, pls, min_size,
+                                         partial(engine.score_masked, features, sampling_mask[members][:, features]))
+            for members in chunks)
+        for members, (chunk_scores, _) in zip(chunks, results):
+            scores[members] = chunk_scores
+        return scores
+
     def _check_n_submodels(self):
         check_scalar(self.n_submodels, 'n_submodels', target_type=int, min_val=2)
 
@@ -145,5 +245,9 @@ class VISSA(PointSelector):
                      max_val=1,
                      include_boundaries='right')
 
+    def _check_mask_chunk_size(self):
+        if self.mask_chunk_size is not None:
+            check_scalar(self.mask_chunk_size, 'mask_chunk_size', target_type=int, min_val=1)
+
     def _check_max_iter(self):
         check_scalar(self.max_iter, 'max_iter', target_type=int, min_val=1)
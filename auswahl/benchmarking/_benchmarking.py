@@ -291,21 +291,37 @@ def _drain_threads(methods):
 def _benchmark_parallel(x: np.array,
                         y: np.array,
                         train_size: float,
+                        features: List[FeatureDescriptor],
                         methods,
                         method_names,
                         reg_metrics,
                         seed: int,
-                        run_index: int):
+                        run_index: int,
+                        reuse_fits: bool = False):
     # prepare model and conduct data splitting
     methods = _copy_methods(methods)
     train_x, test_x, train_y, test_y = train_test_split(x, y, train_size=train_size, random_state=seed)
 
+    # the feature configurations are evaluated within the run, such that the results cached by the methods for the
+    # data split of the run can be reused across the configurations, also if the runs are distributed to processes
+    return [_benchmark_configuration(train_x, test_x, train_y, test_y, n, methods, method_names, reg_metrics, seed,
+                                     run_index, reuse_fits)
+            for n in features]
+
+
+def _benchmark_configuration(train_x, test_x, train_y, test_y, n: FeatureDescriptor, methods, method_names,
+                             reg_metrics, seed: int, run_index: int, reuse_fits: bool):
+    _parameterize(methods, n)
+
     results = dict()
     for method_name, method in zip(method_names, methods):
         # prepare the container holding the results of the evaluation of the current method
         results[method_name] = dict()
         # update the selector method to use the random state of the current evaluation run
         method.reseed(seed)
+        # time the fit from scratch, unless the reuse of cached results is requested
+        if not reuse_fits:
+            method.reset_caches()
         # fit feature selector
         try:
             start = time.process_time()
@@ -382,7 +398,8 @@ def benchmark(data: List[Tuple[np.array, np.array, str, float]],
               stab_metrics: List[StabilityScore] = None,
               n_jobs: int = 1,
               error_log_file: str = "./error_log.txt",
-              verbose: bool = True):
+              verbose: bool = True,
+              reuse_fits: bool = False):
     """Function performing benchmarking of Interval- and PointSelector feature selectors across different datasets and
     different parameterizations of the selectors.
 
@@ -415,7 +432,8 @@ def benchmark(data: List[Tuple[np.array, np.array, str, float]],
 
     n_jobs: int, default=1
         Number of jobs to be used during benchmarking. It is recommended to provide jobs to the benchmarking
-        instead of individual selectors
+        instead of individual selectors. The runs are distributed to the jobs and every run evaluates all features
+        on its data split (see reuse_fits)
 
     error_log_file: str, default="./error_log.txt"
         location and name of the file, in which errors are to be logged
@@ -423,6 +441,12 @@ def benchmark(data: List[Tuple[np.array, np.array, str, float]],
     verbose: bool, default=True
         If True, basic information of the state of benchmarking are plotted
 
+    reuse_fits: bool, default=False
+        If True, the results cached by the selectors during the fit for one feature configuration (for instance the
+        paths of :class:`~auswahl.CARS` with reuse_paths) are reused by the fits for the subsequent configurations of
+        the same run. This saves time, but the measured execution times of the subsequent configurations then
+        only reflect the fits from the cached results. If False, the caches are reset before each fit.
+
     Returns
     -------
     benchmarking results: :class:`~auswahl.benchmarking.DataHandler`
@@ -467,18 +491,17 @@ def benchmark(data: List[Tuple[np.array, np.array, str, float]],
     with Parallel(n_jobs=n_jobs) as parallel:
         for d in range(len(dataset_names)):
             speaker.announce(level=0, message=f'Started benchmark for dataset {dataset_names[d]}')
+            speaker.announce(level=1, message=f'Started {n_runs} runs with {features} features to select')
+            results = parallel(delayed(_benchmark_parallel)(xs[d], ys[d], train_sizes[d], features,
+                                                            methods, method_names, reg_metrics,
+                                                            run_seeds[r], r, reuse_fits)
+                               for r in range(n_runs))
+
             for i, n in enumerate(features):
-                speaker.announce(level=1, message=f'Started cycle with {n} features to select')
                 logger.set_meta(dataset=dataset_names[d], features=n)
-
-                _parameterize(methods, n)
-                results = parallel(delayed(_benchmark_parallel)(xs[d], ys[d], train_sizes[d],
-                                                                methods, method_names, reg_metrics,
-                                                                run_seeds[r], r)
-                                   for r in range(n_runs))
-
                 # insert the results of the processes into the DataHandler object or the error log
-                _pot(pod, dataset_names[d], features[i], method_names, reg_metric_names, results, logger)
+                _pot(pod, dataset_names[d], features[i], method_names, reg_metric_names,
+                     [run_results[i] for run_results in results], logger)
 
     # dump error log
     logger.write_log()
@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 
 from auswahl import BiPLS
+from auswahl._base import FeatureDescriptor
 
 
 @pytest.fixture
@@ -47,3 +48,22 @@ def test_dimension_mismatch(data):
 
     X_t = bipls.transform(X)
     assert X_t.shape[1] == n_intervals_to_select * interval_width
+
+
+def test_elimination_path_reuse(data, monkeypatch):
+    X, y = data
+    bipls = BiPLS(n_intervals_to_select=4, interval_width=5).fit(X, y)
+    calls = []
+    score_candidates = bipls._score_candidates
+    monkeypatch.setattr(bipls, '_score_candidates', lambda *args: calls.append(1) or score_candidates(*args))
+    bipls.reparameterize(FeatureDescriptor((2, 5)))
+    bipls.fit(X, y)
+    assert len(calls) == 0  # the elimination is not repeated
+
+    bipls.reset_caches()
+    bipls.fit(X, y)
+    assert len(calls) > 0
+
+    reference = BiPLS(n_intervals_to_select=2, interval_width=5).fit(X, y)
+    np.testing.assert_array_equal(bipls.support_, reference.support_)
+    np.testing.assert_array_equal(bipls.rank_, reference.rank_)
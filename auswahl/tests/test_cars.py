@@ -4,6 +4,8 @@ from numpy.testing import assert_array_equal, assert_array_almost_equal
 from sklearn.cross_decomposition import PLSRegression
 
 from auswahl import CARS
+from auswahl._cars import _SampleStatistics
+from auswahl.util import get_coef_from_pls
 
 
 @pytest.fixture
@@ -42,3 +44,50 @@ def test_cars_hyperparams(data):
     X_t = selector.transform(X)
     assert X_t.shape[1] == 2
     assert_array_almost_equal(X[:, [1, 5]], X_t)
+
+
+def test_reuse_paths(data, monkeypatch):
+    X, y = data
+    selector = CARS(n_features_to_select=2, n_cars_runs=5, pls=PLSRegression(n_components=1), random_state=7,
+                    reuse_paths=True)
+    selector.fit(X, y)
+    assert len(selector.paths_) == 5
+
+    runs = []
+    fit_cars = selector._fit_cars
+    monkeypatch.setattr(selector, '_fit_cars', lambda *args: runs.append(1) or fit_cars(*args))
+
+    # a larger target not exceeding the first stages is answered from the cached paths
+    selector.set_params(n_features_to_select=3).fit(X, y)
+    assert len(runs) == 0
+    assert sum(selector.support_) == 3
+    assert np.all(selector.support_[[1, 5]])
+
+    # the original target selects the same candidates as a fresh fit
+    selector.set_params(n_features_to_select=2).fit(X, y)
+    fresh = CARS(n_features_to_select=2, n_cars_runs=5, pls=PLSRegression(n_components=1), random_state=7).fit(X, y)
+    assert_array_equal(selector.support_, fresh.support_)
+    assert_array_equal(selector.feature_importance_, fresh.feature_importance_)
+    assert len(runs) == 0
+
+
+def test_early_stopping(data):
+    X, y = data
+    selector = CARS(n_features_to_select=2, n_cars_runs=40, pls=PLSRegression(n_components=1), random_state=7,
+                    wave_size=5)
+    selector.fit(X, y)
+    assert selector.n_cars_runs_used_ < 40
+    assert len(selector.paths_) == selector.n_cars_runs_used_
+    assert_array_equal(selector.support_, [0, 1, 0, 0, 0, 1, 0, 0, 0, 0])
+
+
+def test_sample_statistics(data):
+    X, y = data
+    statistics = _SampleStatistics(X, y)
+    samples, features = np.arange(20, 200), np.array([1, 2, 5, 8])
+    reference = get_coef_from_pls(PLSRegression(n_components=2).fit(X[np.ix_(samples, features)], y[samples]))
+
+    # the stage block is restricted from the shared block and downdated for the excluded samples
+    block = statistics.gram_block(features, statistics.gram_block(np.arange(10)))
+    assert_array_almost_equal(statistics.coefs(samples, features, 2, block), reference.ravel())
+    assert_array_almost_equal(statistics.coefs(samples, features, 2), reference.ravel())
@@ -1,9 +1,17 @@
+import pickle
+
 import numpy as np
 import pytest
+from numpy.testing import assert_array_almost_equal
+from sklearn.cross_decomposition import PLSRegression
+from sklearn.model_selection import GridSearchCV
 from sklearn.utils.estimator_checks import check_estimator
 
+import auswahl._base
+from auswahl import get_engine_memory_limit, set_engine_memory_limit
 from auswahl import VISSA, CARS, VIP, MCUVE, RandomFrog, SPA, IPLS, BiPLS, FiPLS, IntervalRandomFrog
 from auswahl._dummy import DummyPointSelector, DummyIntervalSelector
+from auswahl.util import KernelPLSCV
 
 
 @pytest.mark.parametrize("estimator",
@@ -51,3 +59,86 @@ def test_exceptions_point_selection():
     for est in dummies[1:]:
         with pytest.raises(ValueError):
             est.fit(x, y)
+
+
+def test_evaluate_many():
+    np.random.seed(1337)
+    X = np.random.randn(50, 20)
+    y = 5 * X[:, 3] - 2 * X[:, 7] + np.random.randn(50)
+    selector = IPLS(n_cv_folds=5, n_jobs=2)
+
+    masks = np.random.rand(30, 20) > 0.5
+    masks[0] = False
+    masks[1, :] = False
+    masks[1, 3] = True
+    subsets = [np.flatnonzero(mask) for mask in masks]
+
+    scores = selector.evaluate_many(X, y, masks)
+    assert scores[0] == -np.inf
+    assert_array_almost_equal(scores, selector.evaluate_many(X, y, subsets))
+    for subset, score in zip(subsets[1:], scores[1:]):
+        assert score == pytest.approx(selector.evaluate(X[:, subset], y, None)[0])
+
+
+@pytest.mark.parametrize("model_hyperparams", [{'n_components': [1, 3, 5]}, [{'n_components': [4, 2]}, {'n_components': [6]}]])
+def test_component_search(model_hyperparams):
+    np.random.seed(1337)
+    X = np.random.randn(50, 20)
+    y = 5 * X[:, 3] - 2 * X[:, 7] + np.random.randn(50)
+    selector = IPLS(n_cv_folds=5, model_hyperparams=model_hyperparams)
+
+    cv = GridSearchCV(PLSRegression(), model_hyperparams, cv=5, scoring='neg_mean_squared_error').fit(X[:, :10], y)
+    for score, model in [selector.evaluate(X[:, :10], y, PLSRegression()),
+                         selector.evaluate(X, y, PLSRegression(), features=np.arange(10))]:
+        assert score == pytest.approx(cv.best_score_)
+        assert model.n_components == cv.best_params_['n_components']
+        assert_array_almost_equal(model.coef_, cv.best_estimator_.coef_)
+
+
+def test_evaluate_windows():
+    np.random.seed(1337)
+    X = np.random.randn(50, 20)
+    y = 5 * X[:, 3] - 2 * X[:, 7] + np.random.randn(50)
+    selector = IPLS(n_cv_folds=5, n_jobs=2)
+
+    windows = np.arange(16)[:, None] + np.arange(5)[None, :]
+    assert_array_almost_equal(selector.evaluate_windows(X, y, 5), selector.evaluate_many(X, y, windows))
+
+
+def test_cv_engine_lifecycle(monkeypatch):
+    np.random.seed(1337)
+    X = np.random.randn(50, 20)
+    y = 5 * X[:, 3] - 2 * X[:, 7] + np.random.randn(50)
+
+    builds = []
+
+    class CountingEngine(KernelPLSCV):
+        def __init__(self, *args, **kwargs):
+            builds.append(kwargs.get('band'))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(auswahl._base, 'KernelPLSCV', CountingEngine)
+
+    VISSA(n_features_to_select=5, n_submodels=40, mask_chunk_size=10, n_jobs=4, random_state=7).fit(X, y)
+    assert builds == [None]
+
+    builds.clear()
+    selector = IPLS(n_cv_folds=5, n_jobs=4)
+    selector.evaluate(X, y, PLSRegression(), features=np.arange(5))
+    selector.evaluate_many(X, y, np.random.rand(30, 20) > 0.5)
+    selector.evaluate_windows(X, y, 5)
+    assert builds == [None, None, 5]
+    assert getattr(selector, '_cv_engine', None) is None
+    assert '_cv_engine' not in pickle.loads(pickle.dumps(selector)).__dict__
+
+    # the statistics are not cached beyond the memory limit
+    builds.clear()
+    limit = get_engine_memory_limit()
+    try:
+        set_engine_memory_limit(8 * 7 * 20 * 20 - 1)
+        score = selector.evaluate(X, y, PLSRegression(), features=np.arange(5))[0]
+        set_engine_memory_limit(None)
+        assert score == pytest.approx(selector.evaluate(X, y, PLSRegression(), features=np.arange(5))[0])
+    finally:
+        set_engine_memory_limit(limit)
+    assert builds == [None]
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from auswahl import optimize_intervals
+from auswahl import optimize_intervals, optimize_intervals_batch
 from functools import partial
 
 
@@ -29,3 +29,35 @@ def test_optimization():
     gt = [5, 13, 26]
     _, interval_starts = optimize_intervals(3, 8, scores)
     assert (gt == interval_starts)
+
+
+def test_optimality():
+    rs = np.random.RandomState(42)
+    for _ in range(20):
+        scores = rs.randn(12)
+        # exhaustive search over all placements of two non-overlapping intervals of width 3
+        best = max(scores[i:i + 3].sum() + scores[j:j + 3].sum() for i in range(10) for j in range(i + 3, 10))
+        score, interval_starts = optimize_intervals(2, 3, scores)
+        assert np.isclose(score, best)
+        assert np.isclose(sum(scores[start:start + 3].sum() for start in interval_starts), best)
+
+    # the complete range is covered, if the intervals fill all features
+    assert optimize_intervals(3, 4, rs.randn(12))[1] == [0, 4, 8]
+
+
+def test_batch_optimization():
+    rs = np.random.RandomState(42)
+    scores = rs.randn(4, 40)
+    configurations = [(3, 5), (1, 5), (2, 7)]
+    results = optimize_intervals_batch(configurations, scores)
+    assert len(results) == len(configurations)
+
+    for (n_intervals, interval_width), (batch_scores, batch_starts) in zip(configurations, results):
+        assert batch_scores.shape == (4, n_intervals)
+        assert batch_starts.shape == (4, n_intervals)
+        for run in range(4):
+            score, interval_starts = optimize_intervals(n_intervals, interval_width, scores[run])
+            assert np.isclose(batch_scores[run, -1], score)
+            assert batch_starts[run].tolist() == interval_starts
+            # the optima of smaller numbers of intervals are provided as well
+            assert np.isclose(batch_scores[run, 0], optimize_intervals(1, interval_width, scores[run])[0])
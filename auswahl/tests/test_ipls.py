@@ -24,3 +24,22 @@ def test_ipls(data):
 
     X_t = ipls.transform(X)
     assert X_t.shape[1] == interval_width
+
+
+def test_score_widths(data):
+    X, y = data
+    ipls = IPLS()
+    scores, best_starts = ipls.score_widths(X, y, range(2, 6))
+
+    assert scores.shape == (4, 49)
+    for i, interval_width in enumerate(range(2, 6)):
+        ipls.set_params(interval_width=interval_width).fit(X, y)
+        assert best_starts[i] == np.argmax(ipls.support_)
+        assert np.all(scores[i, X.shape[1] - interval_width + 1:] == -np.inf)
+
+
+def test_racing(data):
+    X, y = data
+    ipls = IPLS(interval_width=5).fit(X, y)
+    racing_ipls = IPLS(interval_width=5, racing_confidence=0.95).fit(X, y)
+    np.testing.assert_array_equal(ipls.support_, racing_ipls.support_)
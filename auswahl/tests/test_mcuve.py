@@ -47,3 +47,23 @@ def test_reproducible_run(data):
     selector1.fit(X, y)
     selector2.fit(X, y)
     assert_array_almost_equal(selector1.stability_, selector2.stability_)
+
+
+def test_parallel_run(data):
+    X, y = data
+    selector = MCUVE(n_features_to_select=2, random_state=42).fit(X, y)
+    parallel_selector = MCUVE(n_features_to_select=2, random_state=42, n_jobs=2).fit(X, y)
+    assert_array_almost_equal(selector.coefs_, parallel_selector.coefs_)
+
+
+def test_streaming_statistics(data):
+    X, y = data
+    selector = MCUVE(n_features_to_select=2, random_state=42).fit(X, y)
+    streaming_selector = MCUVE(n_features_to_select=2, random_state=42, store_coefs=False, n_jobs=2).fit(X, y)
+    assert not hasattr(streaming_selector, 'coefs_')
+    assert streaming_selector.memory_saved_ == selector.coefs_.nbytes
+    assert_array_almost_equal(selector.coefs_.mean(axis=0) / selector.coefs_.std(axis=0),
+                              streaming_selector.stability_)
+
+    selector.set_params(store_coefs=False).fit(X, y)
+    assert not hasattr(selector, 'coefs_')
@@ -106,3 +106,52 @@ def test_reproducible_run_interval_random_frog(interval_data):
     selector1.fit(X, y)
     selector2.fit(X, y)
     assert_array_equal(selector1.frequencies_, selector2.frequencies_)
+
+
+def test_evaluation_cache(data):
+    X, y = data
+
+    selector = RandomFrog(n_features_to_select=2, n_iterations=100, random_state=42)
+    cached_selector = RandomFrog(n_features_to_select=2, n_iterations=100, random_state=42,
+                                 evaluation_cache_size=100)
+    selector.fit(X, y)
+    cached_selector.fit(X, y)
+
+    assert_array_equal(selector.frequencies_, cached_selector.frequencies_)
+    assert cached_selector.evaluation_cache_hits_ > 0
+    assert not hasattr(selector, 'evaluation_cache_hits_')
+
+    # the counters of chains run in worker processes are collected
+    sequential = RandomFrog(n_features_to_select=2, n_iterations=100, random_state=42, n_chains=2,
+                            evaluation_cache_size=100).fit(X, y)
+    parallel = RandomFrog(n_features_to_select=2, n_iterations=100, random_state=42, n_chains=2, n_jobs=2,
+                          evaluation_cache_size=100).fit(X, y)
+    assert parallel.evaluation_cache_hits_ > 0
+    assert (parallel.evaluation_cache_hits_ + parallel.evaluation_cache_misses_ ==
+            sequential.evaluation_cache_hits_ + sequential.evaluation_cache_misses_)
+
+
+def test_multiple_chains(data):
+    X, y = data
+    selector = RandomFrog(n_features_to_select=2, n_iterations=1000, n_chains=4, random_state=7331)
+    selector.fit(X, y)
+    assert selector.chain_frequencies_.shape == (4, X.shape[1])
+    assert selector.chain_correlation_.shape == (4, 4)
+    assert_array_equal(selector.frequencies_, selector.chain_frequencies_.sum(axis=0))
+    assert_array_equal(selector.support_, [1, 0, 0, 0, 0, 1, 0, 0, 0, 0])
+
+    # the chains are seeded upfront, such that the outcome does not depend on the number of workers
+    parallel_selector = RandomFrog(n_features_to_select=2, n_iterations=1000, n_chains=4, random_state=7331,
+                                   n_jobs=2)
+    assert_array_equal(selector.frequencies_, parallel_selector.fit(X, y).frequencies_)
+
+
+def test_convergence(data):
+    X, y = data
+    selector = RandomFrog(n_features_to_select=2, n_iterations=10000, random_state=7331, convergence_interval=50,
+                          convergence_patience=5)
+    selector.fit(X, y)
+    assert selector.n_iter_ < 10000
+    assert selector.frequencies_.max() <= selector.n_iter_
+    assert_array_equal(selector.convergence_trace_[0][-5:], 1)
+    assert_array_equal(selector.support_, [1, 0, 0, 0, 0, 1, 0, 0, 0, 0])
@@ -1,8 +1,9 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
 from auswahl import SPA
+from auswahl._spa import _spa_chains
 
 
 @pytest.fixture
@@ -25,6 +26,33 @@ def ortho_data():
     return X, y
 
 
+@pytest.fixture
+def collinear_data():
+    # smooth, strongly overlapping absorption bands with little noise resemble NIR spectra
+    rs = np.random.RandomState(0)
+    wavelengths = np.linspace(0, 1, 300)
+    centers, widths = rs.rand(8), 0.05 + 0.2 * rs.rand(8)
+    bands = np.exp(-(wavelengths[None, :] - centers[:, None]) ** 2 / widths[:, None] ** 2)
+    return rs.rand(100, 8) @ bands + 1e-7 * rs.randn(100, 300)
+
+
+def _reference_chain(X, seed, n_features_to_select):
+    # per-seed projections deleting the selected features from the data
+    chain = [seed]
+    current = X[:, seed:seed + 1]
+    rest = np.delete(X, seed, 1)
+    feature_map = np.delete(np.arange(X.shape[1]), seed)
+    for j in range(n_features_to_select - 1):
+        current = current / np.linalg.norm(current, ord=2)
+        projections = rest - current @ np.transpose(np.transpose(rest) @ current)
+        next_index = np.argmax(np.linalg.norm(projections, ord=2, axis=0))
+        current = projections[:, next_index:next_index + 1]
+        rest = np.delete(projections, next_index, 1)
+        chain.append(feature_map[next_index])
+        feature_map = np.delete(feature_map, next_index)
+    return chain
+
+
 def test_spa(data):
     X, y = data
     spa = SPA(n_features_to_select=2, n_cv_folds=2)
@@ -43,3 +71,27 @@ def test_orthogonality(ortho_data):
     assert sum(spa.support_) == 3
     selected = np.compress(spa.support_, X, axis=1)
     assert_array_almost_equal(np.transpose(selected) @ selected, np.eye(sum(spa.support_), dtype='float'))
+
+
+def test_score_prefixes(data, monkeypatch):
+    X, y = data
+    spa = SPA(n_features_to_select=5, n_cv_folds=2, score_prefixes=True)
+    spa.fit(X, y)
+    assert spa.prefix_scores_.shape == (5,)
+    assert sum(spa.support_) == np.argmax(spa.prefix_scores_) + 1
+
+    # a shorter chain length is answered from the cached chains
+    calls = []
+    project = spa._project
+    monkeypatch.setattr(spa, '_project', lambda *args: calls.append(1) or project(*args))
+    spa.set_params(n_features_to_select=3, score_prefixes=False).fit(X, y)
+    assert len(calls) == 0
+    assert_array_equal(spa.support_, SPA(n_features_to_select=3, n_cv_folds=2).fit(X, y).support_)
+
+
+def test_projection_chains(collinear_data):
+    X = collinear_data
+    seeds = np.arange(0, X.shape[1], 10)
+    chains = _spa_chains(X, seeds, 20)
+    for seed, chain in zip(seeds, chains):
+        assert_array_equal(chain, _reference_chain(X, seed, 20))
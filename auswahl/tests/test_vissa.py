@@ -1,7 +1,9 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_equal, assert_array_almost_equal
 
+import auswahl._base
+import auswahl._vissa
 from auswahl import VISSA
 
 
@@ -42,3 +44,49 @@ def test_reproducible_run(data):
     selector1.fit(X, y)
     selector2.fit(X, y)
     assert_array_equal(selector1.support_, selector2.support_)
+
+
+def test_submodel_sampling(data, monkeypatch):
+    X, y = data
+    selector = VISSA(n_features_to_select=2, n_submodels=100)
+    frequency = np.arange(0, 100, 10)
+    sampling_mask = selector._sample_submodels(frequency, 100, np.random.RandomState(42))
+    assert_array_equal(sampling_mask.sum(axis=0), frequency)
+
+    # the submodels are ordered in blocks of features
+    monkeypatch.setattr(auswahl._vissa, '_SAMPLING_BLOCK_ELEMENTS', 300)
+    blocked_mask = selector._sample_submodels(frequency, 100, np.random.RandomState(42))
+    assert_array_equal(blocked_mask.sum(axis=0), frequency)
+
+    # the masked scoring of the submodels is consistent with the scoring of the individual subsets
+    selector.fit(X, y)
+    assert_array_almost_equal(selector._score_submodels(X, y, sampling_mask, n_jobs=1),
+                              selector.evaluate_many(X, y, sampling_mask))
+
+
+def test_chunked_masks(data):
+    X, y = data
+    selector = VISSA(n_features_to_select=2, n_submodels=100, random_state=42, mask_chunk_size=32).fit(X, y)
+    parallel_selector = VISSA(n_features_to_select=2, n_submodels=100, random_state=42, mask_chunk_size=32,
+                              n_jobs=2).fit(X, y)
+    assert_array_equal(selector.frequency_, parallel_selector.frequency_)
+    assert_array_equal(selector.support_, [1, 0, 0, 0, 0, 1, 0, 0, 0, 0])
+
+
+def test_chunked_masks_without_engine(data, monkeypatch):
+    X, y = data
+    reference = VISSA(n_features_to_select=2, n_submodels=100, random_state=42, mask_chunk_size=32).fit(X, y)
+
+    # without fold statistics, the chunk workers evaluate their submodels in their own thread
+    monkeypatch.setattr(auswahl._base, '_engine_memory_limit', 0)
+    pools = []
+
+    class RecordingParallel(auswahl._base.Parallel):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs.get('n_jobs'))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(auswahl._base, 'Parallel', RecordingParallel)
+    selector = VISSA(n_features_to_select=2, n_submodels=100, random_state=42, mask_chunk_size=32, n_jobs=2).fit(X, y)
+    assert set(pools) == {1}
+    assert_array_almost_equal(selector.frequency_, reference.frequency_)
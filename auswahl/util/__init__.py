@@ -1,7 +1,14 @@
-from ._optimization import optimize_intervals
+from ._optimization import optimize_intervals, optimize_intervals_batch
 from ._pls_utils import get_coef_from_pls
+from ._kernel_pls import KernelPLSCV, kernel_pls1
+from ._cache import LRUCache, fingerprint
 
 __all__ = [
     'optimize_intervals',
-    'get_coef_from_pls'
+    'optimize_intervals_batch',
+    'get_coef_from_pls',
+    'KernelPLSCV',
+    'kernel_pls1',
+    'LRUCache',
+    'fingerprint'
 ]
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Any
+
+import numpy as np
+
+
+class LRUCache:
+    """Cache of bounded size discarding the least recently used entries first. The cache counts the hits and misses
+    of lookups. Lookups and insertions are thread-safe.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximal number of entries held in the cache.
+
+    Attributes
+    ----------
+    hits: int
+        Number of successful lookups.
+
+    misses: int
+        Number of lookups of keys not held in the cache.
+    """
+
+    def __init__(self, maxsize: int):
+        if not isinstance(maxsize, int) or maxsize <= 0:
+            raise ValueError(f'LRUCache requires a positive integer for argument maxsize. Got {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None):
+        """Retrieve the value stored for key and mark it as most recently used.
+
+        Parameters
+        ----------
+        key: Hashable
+            Key of the entry.
+
+        default: Any, default=None
+            Value returned, if key is not held in the cache.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """Store value for key. The least recently used entry is discarded, if the cache is full.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+def fingerprint(*arrays: np.ndarray) -> str:
+    """Digest of the shapes, types and contents of arrays. Results computed on data can be cached under the
+    fingerprint of the data.
+
+    Parameters
+    ----------
+    arrays: np.ndarray
+        Arrays to be fingerprinted.
+
+    Returns
+    -------
+    fingerprint: str
+        Hexadecimal digest.
+    """
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(repr((array.shape, array.dtype.str)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,455 @@
+from typing import List
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided, sliding_window_view
+from sklearn.model_selection import KFold
+
+
+# upper bound of the number of elements of the window statistics gathered from the band of the cross-product matrices
+_WINDOW_CHUNK_ELEMENTS = 2 ** 22
+
+
+def kernel_pls1(xtx: np.ndarray, xty: np.ndarray, n_components: int, mask: np.ndarray = None):
+    """Fits PLS1 models from the cross-product matrices of centered (and possibly scaled) data using the improved kernel
+    algorithm of Dayal and MacGregor. The algorithm yields the same regression coefficients as the NIPALS algorithm
+    used by :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` for a single target. Since PLS
+    components are nested, the coefficients of all models with 1 to n_components components are returned.
+
+    The computation is batched: a stack of cross-product matrices can be passed to fit several models at once.
+    Alternatively, a single cross-product matrix can be shared by a stack of feature masks. Masked out features are
+    treated as if they were not part of the data.
+
+    Parameters
+    ----------
+    xtx: np.ndarray of shape (n_features, n_features) or (n_models, n_features, n_features)
+        Cross-product matrix X^T X of the centered data.
+
+    xty: np.ndarray of shape (n_features,) or (n_models, n_features)
+        Cross-product vector X^T y of the centered data.
+
+    n_components: int
+        Number of PLS components.
+
+    mask: np.ndarray of shape (n_models, n_features), default=None
+        Masks of the features (values != 0) taken into account by the models.
+
+    Returns
+    -------
+    coefs: np.ndarray of shape (n_models, n_components, n_features)
+        Regression coefficients of the models with 1 to n_components components.
+    """
+    n_features = xtx.shape[-1]
+    batch_shape = np.broadcast_shapes(xtx.shape[:-2], xty.shape[:-1],
+                                      () if mask is None else mask.shape[:-1])
+    n_models = int(np.prod(batch_shape))
+
+    xtx = xtx if xtx.ndim == 2 else xtx.reshape(n_models, n_features, n_features)
+    xty = np.broadcast_to(xty, batch_shape + (n_features,)).reshape(n_models, n_features)
+    if mask is not None:
+        mask = np.broadcast_to(mask, batch_shape + (n_features,)).reshape(n_models, n_features)
+
+    if xtx.ndim == 2:
+        def xtx_product(r):
+            return r @ xtx
+    else:
+        def xtx_product(r):
+            return np.matmul(xtx, r[:, :, None])[:, :, 0]
+
+    coefs = _kernel_pls1(xtx_product, xty, n_components, mask)
+    return coefs.reshape(batch_shape + (n_components, n_features))
+
+
+def _kernel_pls1(xtx_product, xty, n_components, mask=None):
+    """Improved kernel PLS1 algorithm (see :func:`kernel_pls1`) accessing the cross-product matrices only via
+    xtx_product, which maps a batch of vectors r of shape (n_models, n_features) to the products X^T X r. This allows
+    structured cross-product matrices, which are never materialized.
+    """
+    n_models, n_features = xty.shape
+    xty = np.array(xty, dtype=float)
+    if mask is not None:
+        mask = mask.astype(float)
+        xty *= mask
+
+    rotations = np.zeros((n_models, n_components, n_features))
+    x_loadings = np.zeros((n_models, n_components, n_features))
+    y_loadings = np.zeros((n_models, n_components))
+
+    tolerance = np.finfo(float).eps * np.linalg.norm(xty, axis=1)
+    for a in range(n_components):
+        weights = xty if mask is None else xty * mask
+        norm = np.linalg.norm(weights, axis=1)
+        # a vanishing cross-covariance terminates the extraction of components (constant y residual)
+        active = norm > tolerance
+        weights = weights / np.where(active, norm, 1)[:, None]
+        weights[~active] = 0
+
+        r = weights - np.einsum('ba,bak->bk',
+                                np.einsum('bak,bk->ba', x_loadings[:, :a], weights),
+                                rotations[:, :a])
+        xtx_r = xtx_product(r)
+        tt = np.einsum('bk,bk->b', r, xtx_r)
+        tt = np.where(active & (tt > 0), tt, 1)
+
+        p = xtx_r / tt[:, None]
+        q = np.einsum('bk,bk->b', r, xty) / tt
+        q[~active] = 0
+        xty -= p * (q * tt)[:, None]
+
+        rotations[:, a] = r
+        x_loadings[:, a] = p
+        y_loadings[:, a] = q
+
+    return np.cumsum(rotations * y_loadings[:, :, None], axis=1)
+
+
+class KernelPLSCV:
+    """Cross-validation of :py:class:`PLSRegression <sklearn.cross_decomposition.PLSRegression>` models on arbitrary
+    subsets of features. The cross-product matrices, means and scales of the training data of each fold are
+    calculated once. Any feature subset is subsequently scored by slicing the cached statistics and fitting the PLS
+    models with :func:`kernel_pls1`. The folds and scores correspond to
+    :py:func:`cross_val_score <sklearn.model_selection.cross_val_score>` with an integer cv argument and
+    scoring='neg_mean_squared_error'.
+
+    Parameters
+    ----------
+    X: np.ndarray of shape (n_samples, n_features)
+        Spectral data.
+
+    y: np.ndarray of shape (n_samples,)
+        Regression targets.
+
+    n_cv_folds: int
+        Number of cross validation folds.
+
+    scale: bool, default=True
+        Whether the data is scaled to unit variance (see parameter scale of PLSRegression).
+
+    band: int, default=None
+        If not None, only the band of the cross-product matrices covering band consecutive features is calculated.
+        The memory of the statistics is then linear in the number of features, but only windows of at most band
+        consecutive features can be scored (see :meth:`score_windows`).
+
+    Attributes
+    ----------
+    xtx: np.ndarray of shape (n_cv_folds, n_features, n_features) or None
+        Cross-product matrices of the centered and scaled training data of each fold. None, if only the band is
+        calculated.
+
+    xtx_band: np.ndarray of shape (n_cv_folds, n_features, band) or None
+        Band of the cross-product matrices, such that xtx_band[f, i, d] corresponds to xtx[f, i, i + d]. None, if the
+        full cross-product matrices are calculated.
+
+    xty: np.ndarray of shape (n_cv_folds, n_features)
+        Cross-product vectors of the centered and scaled training data of each fold.
+    """
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, n_cv_folds: int, scale: bool = True, band: int = None):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).reshape(-1)
+
+        self.n_samples, self.n_features = X.shape
+        self.n_cv_folds = n_cv_folds
+        self.scale = scale
+        self.band = None if band is None else min(band, self.n_features)
+
+        # center globally before accumulating the cross-products to avoid cancellation
+        global_mean = X.mean(axis=0)
+        x_centered = X - global_mean
+        if self.band is None:
+            gram = x_centered.T @ x_centered
+            self.xtx = np.empty((n_cv_folds, self.n_features, self.n_features))
+            self.xtx_band = None
+        else:
+            gram = _band_products(x_centered, self.band)
+            self.xtx = None
+            self.xtx_band = np.empty((n_cv_folds, self.n_features, self.band))
+
+        self.xty = np.empty((n_cv_folds, self.n_features))
+        self.x_test = []
+        self.y_test = []
+        self.y_scales = np.empty((n_cv_folds,))
+        self.n_train = []
+
+        for f, (train, test) in enumerate(KFold(n_cv_folds).split(X)):
+            x_mean = X[train].mean(axis=0)
+            y_mean = y[train].mean()
+            if scale:
+                x_std = X[train].std(axis=0, ddof=1)
+                x_std[x_std == 0.0] = 1.0
+                y_std = y[train].std(ddof=1)
+                y_std = 1.0 if y_std == 0.0 else y_std
+            else:
+                x_std = np.ones((self.n_features,))
+                y_std = 1.0
+
+            # remove the test samples from the cross-products and correct for the fold mean
+            shift = x_mean - global_mean
+            x_test = x_centered[test]
+            if self.band is None:
+                self.xtx[f] = ((gram - x_test.T @ x_test - len(train) * np.outer(shift, shift))
+                               / np.outer(x_std, x_std))
+            else:
+                self.xtx_band[f] = ((gram - _band_products(x_test, self.band)
+                                     - len(train) * _band_outer(shift, self.band, 0.0))
+                                    / _band_outer(x_std, self.band, 1.0))
+            self.xty[f] = (x_centered[train].T @ (y[train] - y_mean)) / (x_std * y_std)
+
+            self.x_test.append((X[test] - x_mean) / x_std)
+            self.y_test.append((y[test] - y_mean) / y_std)
+            self.y_scales[f] = y_std
+            self.n_train.append(len(train))
+
+    def supports(self, n_components: int):
+        """Check whether models with n_components components can be fitted on the training data of every fold.
+        """
+        return 0 < n_components < min(self.n_train)
+
+    def score(self, features: np.ndarray, n_components: int):
+        """Cross validation score (negative mean squared error) of a PLS model fitted on a subset of features.
+
+        Parameters
+        ----------
+        features: np.ndarray of shape (n_selected,)
+            Indices of the features.
+
+        n_components: int
+            Number of PLS components
+
+        Returns
+        -------
+        score: float
+            Mean score across the folds.
+        """
+        return self.score_batch(np.asarray(features)[None, :], n_components)[0]
+
+    def score_batch(self, features: np.ndarray, n_components: int, all_components: bool = False,
+                    folds: List[int] = None):
+        """Cross validation scores (negative mean squared error) of PLS models fitted on equally sized subsets of
+        features. The models of all subsets are fitted at once.
+
+        Parameters
+        ----------
+        features: np.ndarray of shape (n_subsets, n_selected)
+            Indices of the features of each subset.
+
+        n_components: int
+            Number of PLS components
+
+        all_components: bool, default=False
+            If True, the scores of the models with 1 to n_components components are returned. Since PLS components
+            are nested, these are obtained from the same fit.
+
+        folds: list of int, default=None
+            Folds the scores are averaged over. If None, all folds are used.
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_subsets,) or (n_subsets, n_components)
+            Mean scores across the folds.
+        """
+        features = np.asarray(features)
+
+        def predict(f, n_components):
+            xtx = self.xtx[f][features[:, :, None], features[:, None, :]]
+            coefs = kernel_pls1(xtx, self.xty[f][features], n_components)
+            coefs = coefs if all_components else coefs[:, -1:]
+            return np.einsum('nbk,bak->ban', self.x_test[f][:, features], coefs)
+
+        return self._score(predict, features.shape[0], n_components, all_components, folds)
+
+    def score_windows(self, width: int, n_components: int, start: int = 0, stop: int = None,
+                      all_components: bool = False, folds: List[int] = None, starts: np.ndarray = None):
+        """Cross validation scores (negative mean squared error) of PLS models fitted on windows of consecutive
+        features. The cross-product matrices of the windows are the diagonal blocks of the cached matrices. If only
+        the band of the matrices is cached, the blocks are assembled from the band. The windows are fitted in chunks,
+        such that the memory of the gathered statistics is bounded.
+
+        Parameters
+        ----------
+        width: int
+            Number of features of each window.
+
+        n_components: int
+            Number of PLS components
+
+        start: int, default=0
+            First feature of the first window.
+
+        stop: int, default=None
+            Windows start at the features start, ..., stop - 1. If None, all windows fitting into the features are
+            scored.
+
+        all_components: bool, default=False
+            If True, the scores of the models with 1 to n_components components are returned.
+
+        folds: list of int, default=None
+            Folds the scores are averaged over. If None, all folds are used.
+
+        starts: np.ndarray of shape (n_windows,), default=None
+            First features of the windows. If not None, start and stop are ignored.
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_windows,) or (n_windows, n_components)
+            Mean scores across the folds.
+        """
+        if self.band is not None and width > self.band:
+            raise ValueError(f'Windows of width {width} exceed the band of the statistics ({self.band}).')
+        if starts is None:
+            stop = self.n_features - width + 1 if stop is None else stop
+            starts = np.arange(start, stop)
+        starts = np.asarray(starts, dtype=int)
+        offsets = np.arange(width)
+        chunk_size = max(1, _WINDOW_CHUNK_ELEMENTS // width ** 2)
+
+        def window_xtx(f, chunk):
+            if self.band is None:
+                features = chunk[:, None] + offsets
+                return self.xtx[f][features[:, :, None], features[:, None, :]]
+            # the entry [a, b] of a window is stored in the band at the row of min(a, b) and the offset |a - b|
+            rows = chunk[:, None, None] + np.minimum.outer(offsets, offsets)
+            return self.xtx_band[f][rows, np.abs(np.subtract.outer(offsets, offsets))]
+
+        def predict(f, n_components):
+            predictions = []
+            for i in range(0, len(starts), chunk_size):
+                chunk = starts[i:i + chunk_size]
+                coefs = kernel_pls1(window_xtx(f, chunk), self.xty[f][chunk[:, None] + offsets], n_components)
+                coefs = coefs if all_components else coefs[:, -1:]
+                x_test = sliding_window_view(self.x_test[f], width, axis=1)[:, chunk]
+                predictions.append(np.einsum('nbk,bak->ban', x_test, coefs))
+            return np.concatenate(predictions)
+
+        return self._score(predict, len(starts), n_components, all_components, folds)
+
+    def score_masked(self, features: np.ndarray, masks: np.ndarray, n_components: int,
+                     all_components: bool = False, folds: List[int] = None):
+        """Cross validation scores (negative mean squared error) of PLS models fitted on subsets of a set of
+        features. The cross-product matrix of the features is shared by all subsets, which are specified by masks
+        (see parameter mask of :func:`kernel_pls1`). Hence, no statistics are copied per subset.
+
+        Parameters
+        ----------
+        features: np.ndarray of shape (n_selected,)
+            Indices of the features.
+
+        masks: np.ndarray of shape (n_subsets, n_selected)
+            Masks of the features (values != 0) contained in each subset.
+
+        n_components: int
+            Number of PLS components
+
+        all_components: bool, default=False
+            If True, the scores of the models with 1 to n_components components are returned.
+
+        folds: list of int, default=None
+            Folds the scores are averaged over. If None, all folds are used.
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_subsets,) or (n_subsets, n_components)
+            Mean scores across the folds.
+        """
+        features = np.asarray(features, dtype=int)
+
+        def predict(f, n_components):
+            coefs = kernel_pls1(self.xtx[f][np.ix_(features, features)], self.xty[f][features], n_components,
+                                mask=masks)
+            coefs = coefs if all_components else coefs[:, -1:]
+            return np.einsum('nk,bak->ban', self.x_test[f][:, features], coefs)
+
+        return self._score(predict, masks.shape[0], n_components, all_components, folds)
+
+    def score_extensions(self, selected: np.ndarray, free: np.ndarray, width: int, n_components: int,
+                         all_components: bool = False, folds: List[int] = None):
+        """Cross validation scores (negative mean squared error) of PLS models fitted on a fixed subset of selected
+        features extended by a window of consecutive free features. The cross-product matrices of the candidates
+        are not assembled. The block of the selected features is shared by all candidates, while the cross terms and
+        the blocks of the windows are strided views of the statistics of the free features.
+
+        Parameters
+        ----------
+        selected: np.ndarray of shape (n_selected,)
+            Indices of the features contained in every candidate.
+
+        free: np.ndarray of shape (n_free,)
+            Indices of the free features. The candidates are extended by the windows free[i:i + width].
+
+        width: int
+            Number of free features added to each candidate.
+
+        n_components: int
+            Number of PLS components
+
+        all_components: bool, default=False
+            If True, the scores of the models with 1 to n_components components are returned.
+
+        folds: list of int, default=None
+            Folds the scores are averaged over. If None, all folds are used.
+
+        Returns
+        -------
+        scores: np.ndarray of shape (n_free - width + 1,) or (n_free - width + 1, n_components)
+            Mean scores across the folds.
+        """
+        selected = np.asarray(selected, dtype=int)
+        free = np.asarray(free, dtype=int)
+        n_selected = len(selected)
+        n_windows = len(free) - width + 1
+
+        def predict(f, n_components):
+            xtx_selected = self.xtx[f][np.ix_(selected, selected)]
+            xtx_cross = sliding_window_view(self.xtx[f][np.ix_(selected, free)], width, axis=1)
+            block = self.xtx[f][np.ix_(free, free)]
+            xtx_window = as_strided(block, shape=(n_windows, width, width),
+                                    strides=(block.strides[0] + block.strides[1],) + block.strides, writeable=False)
+
+            def xtx_product(r):
+                r_selected, r_window = r[:, :n_selected], r[:, n_selected:]
+                top = r_selected @ xtx_selected + np.einsum('kbw,bw->bk', xtx_cross, r_window)
+                bottom = (np.einsum('kbw,bk->bw', xtx_cross, r_selected)
+                          + np.matmul(xtx_window, r_window[:, :, None])[:, :, 0])
+                return np.concatenate([top, bottom], axis=1)
+
+            xty = np.concatenate([np.broadcast_to(self.xty[f][selected], (n_windows, n_selected)),
+                                  sliding_window_view(self.xty[f][free], width)], axis=1)
+            coefs = _kernel_pls1(xtx_product, xty, n_components)
+            coefs = coefs if all_components else coefs[:, -1:]
+
+            x_test = self.x_test[f]
+            return (np.einsum('nk,bak->ban', x_test[:, selected], coefs[:, :, :n_selected])
+                    + np.einsum('nbw,baw->ban', sliding_window_view(x_test[:, free], width, axis=1),
+                                coefs[:, :, n_selected:]))
+
+        return self._score(predict, n_windows, n_components, all_components, folds)
+
+    def _score(self, predict, n_subsets, n_components, all_components, folds):
+        """Average the negative mean squared errors of the test predictions of the folds. predict maps a fold and the
+        number of components to the predictions of shape (n_subsets, n_models, n_test_samples) of the models with
+        n_components (or 1 to n_components if all_components is True) components.
+        """
+        folds = range(self.n_cv_folds) if folds is None else folds
+        scores = np.zeros((n_subsets, n_components))
+        for f in folds:
+            residuals = self.y_test[f][None, None, :] - predict(f, n_components)
+            scores[:, -residuals.shape[1]:] -= self.y_scales[f] ** 2 * np.mean(residuals ** 2, axis=2)
+        scores = scores / len(folds)
+        return scores if all_components else scores[:, -1]
+
+
+def _band_products(x, band):
+    """Band of the cross-product matrix x^T x of shape (n_features, band), whose entry [i, d] is the entry [i, i + d]
+    of the matrix. Entries beyond the last feature are zero.
+    """
+    n_features = x.shape[1]
+    products = np.zeros((n_features, band))
+    for d in range(band):
+        products[:n_features - d, d] = np.einsum('si,si->i', x[:, :n_features - d], x[:, d:])
+    return products
+
+
+def _band_outer(v, band, fill):
+    """Band of the outer product of v with itself (see :func:`_band_products`). Entries beyond the last feature are
+    set to fill.
+    """
+    return v[:, None] * sliding_window_view(np.concatenate([v, np.full((band - 1,), fill)]), band)
@@ -1,3 +1,5 @@
+from typing import List, Tuple
+
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view
 
@@ -6,8 +8,9 @@ def optimize_intervals(n_intervals: int, interval_width: int, feature_scores: np
     """The algorithm calculates the optimal non-overlapping placement of n_intervals of width interval_width into the
     range of features. The feature scores are specified in feature_scores (greater better). The algorithm can be used
     for instance to turn every point selection algorithm yielding a score for each feature
-    (such as :class:`~auswahl.VIP`) into an interval selection algorithm. The runtime of the algorithm is :math:`O(kn)`, with
-    k being n_intervals and n feature_scores.size
+    (such as :class:`~auswahl.VIP`) into an interval selection algorithm. The runtime and memory of the algorithm are
+    :math:`O(kn)`, with k being n_intervals and n feature_scores.size. Ties are resolved in favor of intervals placed
+    further to the left.
 
     Parameters
     ----------
@@ -26,41 +29,114 @@ def optimize_intervals(n_intervals: int, interval_width: int, feature_scores: np
         Tuple of overall score of the interval placement, list of interval starts.
     """
 
+    _check_configuration('optimize_intervals', n_intervals, interval_width)
+    if len(feature_scores.shape) != 1:
+        raise ValueError(f'optimize_intervals requires an array of rank one. Got rank {len(feature_scores.shape)}')
+    _check_n_features('optimize_intervals', n_intervals, interval_width, feature_scores.size)
+
+    # interval_scores[i]: total score of the interval starting at i
+    interval_scores = np.sum(sliding_window_view(feature_scores, interval_width), axis=1)
+    scores, (interval_starts,) = _place_intervals(interval_scores[None, :], interval_width, [n_intervals])
+    return scores[0, -1], interval_starts[0].tolist()
+
+
+def optimize_intervals_batch(configurations: List[Tuple[int, int]], feature_scores: np.ndarray):
+    """Batched version of :func:`optimize_intervals`, which calculates the optimal placements for several sets of
+    feature scores (for instance of several runs of a point selection algorithm) and several configurations of
+    intervals at once. The interval scores are calculated once per interval width and the placements of all sets of
+    feature scores are calculated simultaneously. Since the placement of n intervals is found by placing 1 to n
+    intervals, the optimal scores of all smaller numbers of intervals are returned as well.
+
+    Parameters
+    ----------
+    configurations: list of tuple of int
+        Pairs (n_intervals, interval_width) of the number and width of the intervals to be placed.
+
+    feature_scores: np.ndarray of shape (n_runs, n)
+        Scores of variables (greater better) of each run.
+
+    Returns
+    -------
+    list of tuple: (np.ndarray of shape (n_runs, n_intervals), np.ndarray of shape (n_runs, n_intervals))
+        Tuple for each configuration of the overall scores of the optimal placements of 1 to n_intervals intervals and
+        the interval starts of the optimal placement of n_intervals intervals of each run.
+    """
+
+    if len(feature_scores.shape) != 2:
+        raise ValueError(f'optimize_intervals_batch requires an array of rank two. '
+                         f'Got rank {len(feature_scores.shape)}')
+    for n_intervals, interval_width in configurations:
+        _check_configuration('optimize_intervals_batch', n_intervals, interval_width)
+        _check_n_features('optimize_intervals_batch', n_intervals, interval_width, feature_scores.shape[1])
+
+    # the interval scores and the dynamic program are shared by all configurations of an interval width
+    placements = {}
+    for interval_width in set(width for _, width in configurations):
+        counts = sorted(set(n for n, width in configurations if width == interval_width))
+        interval_scores = np.sum(sliding_window_view(feature_scores, interval_width, axis=1), axis=2)
+        scores, interval_starts = _place_intervals(interval_scores, interval_width, counts)
+        for n_intervals, starts in zip(counts, interval_starts):
+            placements[(n_intervals, interval_width)] = (scores[:, :n_intervals], starts)
+
+    return [placements[(n_intervals, interval_width)] for n_intervals, interval_width in configurations]
+
+
+def _place_intervals(interval_scores, interval_width, counts):
+    """Dynamic program of the optimal placement of intervals given the scores of the intervals of each run, indexed
+    by their start. Returns the optimal scores of 1 to max(counts) intervals of shape (n_runs, max(counts)) and a list
+    of the interval starts of shape (n_runs, n) of the optimal placements of n intervals for each n in counts.
+    """
+    n_intervals = max(counts)
+    n_runs, n_windows = interval_scores.shape
+    n_features = n_windows + interval_width - 1
+
+    # row[:, i + 1] specifies the score of allocating k intervals in the range of features {0, ..., i} for the current
+    # k. The first column (range of no features) serves as sentinel. Infeasible allocations score -inf
+    row = np.zeros((n_runs, n_features + 1))
+    scores = np.empty((n_runs, n_intervals))
+    # backpointers[k - 1, :, i] specifies whether an interval ends at feature i in the best allocation of k intervals
+    # in the range of features {0, ..., i}
+    backpointers = np.zeros((n_intervals, n_runs, n_features), dtype=bool)
+
+    # the best allocation of k intervals up to feature i is the maximum of the one up to feature i - 1 (no interval
+    # ends at i) and the score of the interval ending at i added to the best allocation of k - 1 intervals before the
+    # interval. Hence, each row is a running maximum over the features
+    for k in range(n_intervals):
+        score_incl = np.full((n_runs, n_features), -np.inf)
+        score_incl[:, interval_width - 1:] = interval_scores + row[:, :n_windows]
+        row = np.concatenate([np.full((n_runs, 1), -np.inf), np.maximum.accumulate(score_incl, axis=1)], axis=1)
+        backpointers[k] = score_incl > row[:, :-1]
+        scores[:, k] = row[:, -1]
+
+    # trace the interval starts back from the allocations in all features: the k-th interval ends at the last
+    # feature before the following interval, at which the best allocation of k intervals was improved
+    interval_starts = []
+    for n in counts:
+        starts = np.empty((n_runs, n), dtype=int)
+        bound = np.full((n_runs,), n_features)
+        for k in range(n, 0, -1):
+            improved = backpointers[k - 1] & (np.arange(n_features)[None, :] < bound[:, None])
+            bound = n_features - np.argmax(improved[:, ::-1], axis=1) - interval_width
+            starts[:, k - 1] = bound
+        interval_starts.append(starts)
+
+    return scores, interval_starts
+
+
+def _check_configuration(name, n_intervals, interval_width):
     if not isinstance(n_intervals, int):
-        raise ValueError(f'optimize_intervals requires an integer for argument n_intervals. Got {type(n_intervals)}')
+        raise ValueError(f'{name} requires an integer for argument n_intervals. Got {type(n_intervals)}')
     if not isinstance(interval_width, int):
-        raise ValueError(f'optimize_intervals requires an integer for argument interval_width.'
+        raise ValueError(f'{name} requires an integer for argument interval_width.'
                          f'Got {type(interval_width)}')
     if n_intervals <= 0:
-        raise ValueError(f'optimize_intervals requires a positive integer for argument n_intervals. Got {n_intervals}')
+        raise ValueError(f'{name} requires a positive integer for argument n_intervals. Got {n_intervals}')
     if interval_width <= 0:
-        raise ValueError(f'optimize_intervals requires a positive integer for argument interval_width.'
+        raise ValueError(f'{name} requires a positive integer for argument interval_width.'
                          f'Got {interval_width}')
-    if len(feature_scores.shape) != 1:
-        raise ValueError(f'optimize_intervals requires an array of rank one. Got rank {len(feature_scores.shape)}')
-    if feature_scores.size < n_intervals * interval_width:
-        raise ValueError(f'optimize_intervals requires an array of feature scores with at least n_interval *'
-                         f'interval_width. Required at least {n_intervals * interval_width}, got {feature_scores.size}')
-
-    # costs[i]: total score of the interval starting at i
-    intervals = sliding_window_view(feature_scores, interval_width)
-    interval_scores = np.sum(intervals, axis=1)
-
-    # table[i, k] specifies the score of allocating in the range of features {0, ..., i} k intervals
-    # initialize with sentinels
-    # introduce index -1 sentinel into the first axis of the table
-    table = -1000000 * np.ones((feature_scores.size + 1, n_intervals + 1))
-    table[:, 0] = 0  # zero costs for no intervals
-    interval_starts = [[[] for _ in range(n_intervals + 1)] for _ in range(feature_scores.size)]
-
-    for i in range(interval_width - 1, feature_scores.size):
-        for k in range(1, min((i + 1) // interval_width, n_intervals) + 1):
-            score_incl_i = interval_scores[i - interval_width + 1] + table[i - interval_width, k - 1]
-            if score_incl_i > table[i-1, k]:
-                table[i, k] = score_incl_i
-                interval_starts[i][k] = interval_starts[i - interval_width][k - 1] + [i - interval_width + 1]
-            else:
-                table[i, k] = table[i - 1, k]
-                interval_starts[i][k] = interval_starts[i - 1][k].copy()
-
-    return table[feature_scores.size - 1, n_intervals], interval_starts[feature_scores.size - 1][n_intervals]
+
+
+def _check_n_features(name, n_intervals, interval_width, n_features):
+    if n_features < n_intervals * interval_width:
+        raise ValueError(f'{name} requires an array of feature scores with at least n_interval *'
+                         f'interval_width. Required at least {n_intervals * interval_width}, got {n_features}')
@@ -2,7 +2,9 @@ import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
 from sklearn.cross_decomposition import PLSRegression
+from sklearn.model_selection import cross_val_score
 
+from auswahl.util import KernelPLSCV, LRUCache, kernel_pls1
 from auswahl.util._pls_utils import get_coef_from_pls
 
 
@@ -21,3 +23,64 @@ def test_coef(data):
 
     coef_ = get_coef_from_pls(pls)
     assert_array_almost_equal(pls.coef_.T, coef_)
+
+
+@pytest.mark.parametrize("scale", [True, False])
+def test_kernel_pls_cv(data, scale):
+    X, y = data
+    engine = KernelPLSCV(X, y, n_cv_folds=5, scale=scale)
+    for features in [[0], [0, 5], [1, 2, 3, 5, 8], np.arange(10)]:
+        n_components = min(2, len(features))
+        scores = cross_val_score(PLSRegression(n_components, scale=scale), X[:, features], y, cv=5,
+                                 scoring='neg_mean_squared_error')
+        assert engine.score(np.array(features), n_components) == pytest.approx(np.mean(scores))
+
+
+def test_kernel_pls_cv_structured(data):
+    X, y = data
+    engine = KernelPLSCV(X, y, n_cv_folds=5)
+    selected, free = np.array([1, 5]), np.array([0, 2, 3, 4, 6, 7, 8, 9])
+    candidates = np.stack([np.concatenate([selected, free[i:i + 3]]) for i in range(len(free) - 2)])
+    assert_array_almost_equal(engine.score_extensions(selected, free, 3, 2, all_components=True),
+                              engine.score_batch(candidates, 2, all_components=True))
+    assert_array_almost_equal(engine.score_windows(3, 2, start=2),
+                              engine.score_batch(np.arange(2, 8)[:, None] + np.arange(3), 2))
+
+
+@pytest.mark.parametrize("scale", [True, False])
+def test_kernel_pls_cv_band(data, scale):
+    X, y = data
+    engine = KernelPLSCV(X, y, n_cv_folds=5, scale=scale)
+    banded = KernelPLSCV(X, y, n_cv_folds=5, scale=scale, band=4)
+    assert banded.xtx is None and banded.xtx_band.shape == (5, 10, 4)
+    for width in [1, 3, 4]:
+        assert_array_almost_equal(banded.score_windows(width, 1, all_components=True),
+                                  engine.score_windows(width, 1, all_components=True))
+    assert_array_almost_equal(banded.score_windows(3, 2, starts=np.array([6, 0, 2])),
+                              engine.score_batch(np.array([6, 0, 2])[:, None] + np.arange(3), 2))
+    with pytest.raises(ValueError):
+        banded.score_windows(5, 2)
+
+
+def test_kernel_pls_coef(data):
+    X, y = data
+    pls = PLSRegression(n_components=3).fit(X, y)
+
+    x_centered = (X - X.mean(axis=0)) / X.std(axis=0, ddof=1)
+    y_centered = (y - y.mean()) / y.std(ddof=1)
+    coefs = kernel_pls1(x_centered.T @ x_centered, x_centered.T @ y_centered, n_components=3)
+    assert_array_almost_equal(get_coef_from_pls(pls).squeeze(), coefs[-1] * y.std(ddof=1))
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used entry
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
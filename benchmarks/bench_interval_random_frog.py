@@ -0,0 +1,70 @@
+"""Microbenchmark of the helpers of :class:`auswahl.IntervalRandomFrog`, which are called in every iteration. The
+helpers are checked against reference implementations with Python loops, which they have to reproduce at least
+MIN_SPEEDUP times faster.
+
+Run with ``python benchmarks/bench_interval_random_frog.py``.
+"""
+import timeit
+
+import numpy as np
+from sklearn.cross_decomposition import PLSRegression
+
+from auswahl import IntervalRandomFrog
+from auswahl.util import get_coef_from_pls
+
+N_WINDOWS = 2000
+INTERVAL_WIDTH = 10
+N_INTERVALS = 200
+N_REPEATS = 1000
+MIN_SPEEDUP = 3
+
+
+def reference_idx_to_mask(selector, feature_idx):
+    mask = np.zeros(selector.n_windows_ + selector.interval_width_ - 1, dtype=bool)
+    for idx in feature_idx:
+        mask[idx:idx + selector.interval_width_] = 1
+    return mask
+
+
+def reference_feature_scores(selector, pls, feature_idx):
+    scores = np.zeros(selector.n_windows_ + selector.interval_width_ - 1)
+    scores[reference_idx_to_mask(selector, feature_idx)] = abs(get_coef_from_pls(pls).squeeze())
+    return [sum(scores[idx:idx + selector.interval_width_]) for idx in feature_idx]
+
+
+def main():
+    rs = np.random.RandomState(0)
+    selector = IntervalRandomFrog(interval_width=INTERVAL_WIDTH)
+    selector.n_windows_ = N_WINDOWS
+    selector.interval_width_ = INTERVAL_WIDTH
+
+    feature_idx = np.sort(rs.choice(N_WINDOWS, N_INTERVALS, replace=False))
+    mask = selector._idx_to_mask(feature_idx)
+    X = rs.randn(50, len(mask))
+    pls = PLSRegression(n_components=2).fit(X[:, mask], rs.randn(50))
+
+    np.testing.assert_array_equal(mask, reference_idx_to_mask(selector, feature_idx))
+    np.testing.assert_allclose(selector._get_feature_score_from_model(pls, feature_idx),
+                               reference_feature_scores(selector, pls, feature_idx))
+
+    def per_call(call):
+        return min(timeit.repeat(call, number=N_REPEATS, repeat=5)) / N_REPEATS
+
+    print(f'{N_WINDOWS} windows of width {INTERVAL_WIDTH}, {N_INTERVALS} intervals')
+    helpers = {
+        '_idx_to_mask': (lambda: selector._idx_to_mask(feature_idx),
+                         lambda: reference_idx_to_mask(selector, feature_idx)),
+        '_get_feature_score_from_model': (lambda: selector._get_feature_score_from_model(pls, feature_idx),
+                                          lambda: reference_feature_scores(selector, pls, feature_idx)),
+    }
+    for name, (call, reference) in helpers.items():
+        seconds, reference_seconds = per_call(call), per_call(reference)
+        print(f'{name:>32}: {seconds * 1e6:8.1f} us per call (reference {reference_seconds * 1e6:8.1f} us)')
+        assert reference_seconds >= MIN_SPEEDUP * seconds, \
+            f'{name} is less than {MIN_SPEEDUP} times faster than the reference'
+    seconds = per_call(lambda: PLSRegression(n_components=2).fit(X[:, mask], X[:, 0]))
+    print(f'{"PLSRegression.fit":>32}: {seconds * 1e6:8.1f} us per call')
+
+
+if __name__ == '__main__':
+    main()
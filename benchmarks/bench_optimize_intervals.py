@@ -0,0 +1,78 @@
+"""Benchmark of :func:`auswahl.optimize_intervals`, which is called by :class:`auswahl.PseudoIntervalSelector` in
+every fit. The result is checked against a reference implementation of the dynamic program with Python loops,
+which optimize_intervals has to reproduce at least MIN_SPEEDUP times faster. optimize_intervals_batch has to reproduce
+the separate calls for several runs and configurations at least MIN_BATCH_SPEEDUP times faster.
+
+Run with ``python benchmarks/bench_optimize_intervals.py``.
+"""
+import timeit
+
+import numpy as np
+
+from auswahl import optimize_intervals, optimize_intervals_batch
+
+N_FEATURES = 10000
+N_INTERVALS = 50
+INTERVAL_WIDTH = 20
+N_REPEATS = 5
+MIN_SPEEDUP = 10
+
+N_RUNS = 10
+MIN_BATCH_SPEEDUP = 1.2
+CONFIGURATIONS = [(n_intervals, width) for n_intervals in (5, 10) for width in (10, 20, 40, 80)]
+
+
+def reference_optimize_intervals(n_intervals, interval_width, feature_scores):
+    interval_scores = np.sum(np.lib.stride_tricks.sliding_window_view(feature_scores, interval_width), axis=1)
+    # the extra last row is addressed as row -1 by the recursion
+    table = -1000000 * np.ones((feature_scores.size + 1, n_intervals + 1))
+    table[:, 0] = 0
+    interval_starts = [[[] for _ in range(n_intervals + 1)] for _ in range(feature_scores.size)]
+    for i in range(interval_width - 1, feature_scores.size):
+        for k in range(1, min((i + 1) // interval_width, n_intervals) + 1):
+            score_incl_i = interval_scores[i - interval_width + 1] + table[i - interval_width, k - 1]
+            if score_incl_i > table[i - 1, k]:
+                table[i, k] = score_incl_i
+                interval_starts[i][k] = interval_starts[i - interval_width][k - 1] + [i - interval_width + 1]
+            else:
+                table[i, k] = table[i - 1, k]
+                interval_starts[i][k] = interval_starts[i - 1][k].copy()
+    return table[feature_scores.size - 1, n_intervals], interval_starts[feature_scores.size - 1][n_intervals]
+
+
+def main():
+    feature_scores = np.random.RandomState(0).rand(N_FEATURES)
+    score, starts = optimize_intervals(N_INTERVALS, INTERVAL_WIDTH, feature_scores)
+    reference_score, reference_starts = reference_optimize_intervals(N_INTERVALS, INTERVAL_WIDTH, feature_scores)
+    np.testing.assert_allclose(score, reference_score)
+    np.testing.assert_array_equal(sorted(starts), reference_starts)
+
+    seconds = min(timeit.repeat(lambda: optimize_intervals(N_INTERVALS, INTERVAL_WIDTH, feature_scores),
+                                number=1, repeat=N_REPEATS))
+    reference_seconds = min(timeit.repeat(
+        lambda: reference_optimize_intervals(N_INTERVALS, INTERVAL_WIDTH, feature_scores), number=1, repeat=1))
+    print(f'{N_FEATURES} features, {N_INTERVALS} intervals of width {INTERVAL_WIDTH}: {seconds * 1e3:.1f} ms per call '
+          f'(reference {reference_seconds * 1e3:.1f} ms)')
+    assert reference_seconds >= MIN_SPEEDUP * seconds, \
+        f'optimize_intervals is less than {MIN_SPEEDUP} times faster than the reference'
+
+    run_scores = np.random.RandomState(0).rand(N_RUNS, N_FEATURES)
+    for (n, width), (batch_scores, batch_starts) in zip(CONFIGURATIONS,
+                                                        optimize_intervals_batch(CONFIGURATIONS, run_scores)):
+        for scores, batch_score, starts in zip(run_scores, batch_scores[:, -1], batch_starts):
+            score, separate_starts = optimize_intervals(n, width, scores)
+            np.testing.assert_allclose(batch_score, score)
+            np.testing.assert_array_equal(np.sort(starts), np.sort(separate_starts))
+
+    seconds = min(timeit.repeat(lambda: [optimize_intervals(n, width, scores) for scores in run_scores
+                                         for n, width in CONFIGURATIONS], number=1, repeat=N_REPEATS))
+    batch_seconds = min(timeit.repeat(lambda: optimize_intervals_batch(CONFIGURATIONS, run_scores),
+                                      number=1, repeat=N_REPEATS))
+    print(f'{N_RUNS} runs, {len(CONFIGURATIONS)} configurations: {seconds * 1e3:.1f} ms separately, '
+          f'{batch_seconds * 1e3:.1f} ms batched')
+    assert seconds >= MIN_BATCH_SPEEDUP * batch_seconds, \
+        f'optimize_intervals_batch is less than {MIN_BATCH_SPEEDUP} times faster than separate calls'
+
+
+if __name__ == '__main__':
+    main()